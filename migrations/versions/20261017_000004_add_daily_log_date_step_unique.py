@@ -0,0 +1,29 @@
+"""Add unique constraint on daily_log (date, step_id).
+
+Revision ID: 20261017_000004
+Revises: 20260324_000003
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_000004"
+down_revision = "20260324_000003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 日本語: 重複ログは最初の行(従来の更新・参照対象)のみ残す / English: Keep only the first row of duplicate logs, the one earlier writes updated and reads returned
+    op.execute(
+        "DELETE FROM daily_log WHERE id NOT IN "
+        "(SELECT MIN(id) FROM daily_log GROUP BY date, step_id)"
+    )
+    op.create_unique_constraint("uq_daily_log_date_step", "daily_log", ["date", "step_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_daily_log_date_step", "daily_log", type_="unique")
@@ -0,0 +1,36 @@
+"""Add unique constraint on day_log (guest_id, date).
+
+Revision ID: 20261017_000005
+Revises: 20261017_000004
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_000005"
+down_revision = "20261017_000004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 日本語: 重複日報の本文は最初の行(従来の参照結果)へ id 順に改行連結し、利用者の記述を失わない / English: Fold duplicate day log text into the first row (what reads returned), newline-joined in id order, so no user text is lost
+    op.execute(
+        "UPDATE day_log SET content = merged.content "
+        "FROM (SELECT MIN(id) AS keep_id, string_agg(content, E'\\n' ORDER BY id) AS content "
+        "FROM day_log GROUP BY guest_id, date HAVING COUNT(*) > 1) AS merged "
+        "WHERE day_log.id = merged.keep_id"
+    )
+    # 日本語: 連結済みの残りの重複行を削除 / English: Drop the remaining duplicates once their text is folded in
+    op.execute(
+        "DELETE FROM day_log WHERE id NOT IN "
+        "(SELECT MIN(id) FROM day_log GROUP BY guest_id, date)"
+    )
+    op.create_unique_constraint("uq_day_log_guest_date", "day_log", ["guest_id", "date"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_day_log_guest_date", "day_log", type_="unique")
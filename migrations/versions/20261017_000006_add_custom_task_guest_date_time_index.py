@@ -0,0 +1,28 @@
+"""Add composite index on custom_task (guest_id, date, time).
+
+Revision ID: 20261017_000006
+Revises: 20261017_000005
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_000006"
+down_revision = "20261017_000005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_custom_task_guest_date_time",
+        "custom_task",
+        ["guest_id", "date", "time"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_custom_task_guest_date_time", table_name="custom_task")
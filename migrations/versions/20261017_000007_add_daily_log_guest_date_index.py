@@ -0,0 +1,28 @@
+"""Add composite index on daily_log (guest_id, date).
+
+Revision ID: 20261017_000007
+Revises: 20261017_000006
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_000007"
+down_revision = "20261017_000006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_daily_log_guest_date",
+        "daily_log",
+        ["guest_id", "date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_log_guest_date", table_name="daily_log")
@@ -0,0 +1,36 @@
+"""Add covering unique index on daily_log (step_id, date).
+
+Revision ID: 20261017_000008
+Revises: 20261017_000007
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_000008"
+down_revision = "20261017_000007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 日本語: (step_id, date) の一意索引が (date, step_id) の一意制約を置き換え、書き込み時の索引を増やさない / English: The (step_id, date) unique index replaces the (date, step_id) unique constraint so writes maintain no extra index
+    op.create_index(
+        "ix_daily_log_step_date",
+        "daily_log",
+        ["step_id", "date"],
+        unique=True,
+        postgresql_include=["guest_id", "done", "memo"],
+    )
+    op.drop_constraint("uq_daily_log_date_step", "daily_log", type_="unique")
+    # 日本語: guest_id 単独の索引は (guest_id, date) の先頭列で賄える / English: The guest_id-only index is redundant with the (guest_id, date) prefix
+    op.drop_index("ix_daily_log_guest_id", table_name="daily_log")
+
+
+def downgrade() -> None:
+    op.create_index("ix_daily_log_guest_id", "daily_log", ["guest_id"])
+    op.create_unique_constraint("uq_daily_log_date_step", "daily_log", ["date", "step_id"])
+    op.drop_index("ix_daily_log_step_date", table_name="daily_log")
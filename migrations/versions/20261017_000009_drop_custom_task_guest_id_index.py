@@ -0,0 +1,25 @@
+"""Drop custom_task guest_id index covered by (guest_id, date, time).
+
+Revision ID: 20261017_000009
+Revises: 20261017_000008
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_000009"
+down_revision = "20261017_000008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 日本語: guest_id 単独の索引は (guest_id, date, time) の先頭列で賄える / English: The guest_id-only index is redundant with the (guest_id, date, time) prefix
+    op.drop_index("ix_custom_task_guest_id", table_name="custom_task")
+
+
+def downgrade() -> None:
+    op.create_index("ix_custom_task_guest_id", "custom_task", ["guest_id"])
@@ -0,0 +1,25 @@
+"""Drop day_log guest_id index covered by uq_day_log_guest_date.
+
+Revision ID: 20261017_000010
+Revises: 20261017_000009
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_000010"
+down_revision = "20261017_000009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 日本語: guest_id 単独の索引は一意制約 (guest_id, date) の先頭列で賄える / English: The guest_id-only index is redundant with the (guest_id, date) unique constraint's prefix
+    op.drop_index("ix_day_log_guest_id", table_name="day_log")
+
+
+def downgrade() -> None:
+    op.create_index("ix_day_log_guest_id", "day_log", ["guest_id"])
@@ -7,7 +7,8 @@ import json
 import os
 from pathlib import Path
 import re
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Tuple
 from urllib.parse import urlparse
 
 # 日本語: Multi-Agent-Platform の設定モーダルと揃えるデフォルト / English: Defaults aligned with the platform modal
@@ -35,40 +36,74 @@ AVAILABLE_MODELS: List[Dict[str, str]] = [
     {"provider": "groq", "model": "qwen/qwen3-32b", "label": "Qwen3 32B (Groq)"},
 ]
 
-# 日本語: プロバイダごとの環境変数・既定URL / English: Provider-specific env vars and defaults
-PROVIDER_DEFAULTS: Dict[str, Dict[str, str | List[str] | None]] = {
-    "openai": {
+# 日本語: プロバイダごとの環境変数・既定URL（読み取り専用） / English: Provider-specific env vars and defaults (read-only)
+PROVIDER_DEFAULTS: Dict[str, Mapping[str, str | Tuple[str, ...] | None]] = {
+    "openai": MappingProxyType({
         "api_key_env": "OPENAI_API_KEY",
-        "api_key_aliases": [],
+        "api_key_aliases": (),
         "base_url_env": "OPENAI_BASE_URL",
-        "base_url_env_aliases": [],
+        "base_url_env_aliases": (),
         "default_base_url": None,  # 純正OpenAIはNone (デフォルト)
-    },
-    "claude": {
+    }),
+    "claude": MappingProxyType({
         "api_key_env": "CLAUDE_API_KEY",
-        "api_key_aliases": ["ANTHROPIC_API_KEY"],
+        "api_key_aliases": ("ANTHROPIC_API_KEY",),
         "base_url_env": "CLAUDE_API_BASE",
-        "base_url_env_aliases": [],
+        "base_url_env_aliases": (),
         # Native Anthropic API
         "default_base_url": None,
-    },
-    "gemini": {
+    }),
+    "gemini": MappingProxyType({
         "api_key_env": "GEMINI_API_KEY",
-        "api_key_aliases": ["GOOGLE_API_KEY", "PALM_API_KEY"],
+        "api_key_aliases": ("GOOGLE_API_KEY", "PALM_API_KEY"),
         "base_url_env": "GEMINI_API_BASE",
-        "base_url_env_aliases": [],
+        "base_url_env_aliases": (),
         # Google の OpenAI 互換エンドポイント（Multi-Agent-Platform と共通）
         # 公式ドキュメント: https://generativelanguage.googleapis.com/v1beta/openai/
         "default_base_url": "https://generativelanguage.googleapis.com/v1beta/openai",
-    },
-    "groq": {
+    }),
+    "groq": MappingProxyType({
         "api_key_env": "GROQ_API_KEY",
-        "api_key_aliases": [],
+        "api_key_aliases": (),
         "base_url_env": "GROQ_API_BASE",
-        "base_url_env_aliases": [],
+        "base_url_env_aliases": (),
         "default_base_url": "https://api.groq.com/openai/v1",
-    },
+    }),
 }
+
+
+class ProviderMeta(NamedTuple):
+    # 日本語: 解決済みのプロバイダ設定（環境変数候補は小文字版も含む） / English: Resolved provider settings (env candidates include lowercase variants)
+    api_env_names: Tuple[str, ...]
+    base_env_names: Tuple[str, ...]
+    default_base_url: str | None
+
+
+def _env_name_candidates(primary: object, aliases: object) -> Tuple[str, ...]:
+    # 日本語: 主名・別名と各小文字版を探索順に並べる / English: Order primary/alias env names with their lowercase variants
+    names: List[str] = []
+    for name in (primary, *(aliases or ())):
+        if isinstance(name, str):
+            names.append(name)
+            names.append(name.lower())
+    return tuple(names)
+
+
+def _build_provider_meta(meta: Mapping[str, str | Tuple[str, ...] | None]) -> ProviderMeta:
+    # 日本語: 生の設定値を属性アクセス可能な構造へ変換 / English: Convert raw defaults into an attribute-access struct
+    default_base = meta.get("default_base_url")
+    return ProviderMeta(
+        api_env_names=_env_name_candidates(meta.get("api_key_env"), meta.get("api_key_aliases")),
+        base_env_names=_env_name_candidates(meta.get("base_url_env"), meta.get("base_url_env_aliases")),
+        default_base_url=default_base if isinstance(default_base, str) else None,
+    )
+
+
+# 日本語: ホットパスで dict.get を繰り返さないよう事前計算 / English: Precompute once so the hot path avoids repeated dict lookups
+_PROVIDER_META: Dict[str, ProviderMeta] = {
+    name: _build_provider_meta(meta) for name, meta in PROVIDER_DEFAULTS.items()
+}
+
 # 日本語: 画像入力対応プロバイダ / English: Providers that support vision input
 VISION_SUPPORTED_PROVIDERS = {"openai", "claude", "gemini"}
 
@@ -205,43 +240,35 @@ def _load_selection(agent_key: str) -> Dict[str, str | None]:
     return _coerce_selection(chosen)
 
 
-def _resolve_api_key(meta: Dict[str, str | List[str] | None]) -> str:
-    # 日本語: API キーの候補を順番に探索 / English: Resolve API key from env candidates
-    """Resolve provider-specific API key without exposing the value."""
-
-    candidates = []
-    primary = meta.get("api_key_env")
-    aliases = meta.get("api_key_aliases") or []
-    if isinstance(primary, str):
-        candidates.append(primary)
-        candidates.append(primary.lower())
-    if isinstance(aliases, list):
-        for alias in aliases:
-            if isinstance(alias, str):
-                candidates.append(alias)
-                candidates.append(alias.lower())
-
-    for env_name in candidates:
+def _first_env(env_names: Tuple[str, ...]) -> str | None:
+    # 日本語: 候補のうち最初に値がある環境変数を返す / English: Return the first non-empty env var among candidates
+    for env_name in env_names:
         value = os.getenv(env_name)
         if value:
             return value
+    return None
 
-    return ""
 
+def _resolve_api_key(meta: ProviderMeta) -> str:
+    # 日本語: API キーの候補を順番に探索 / English: Resolve API key from env candidates
+    """Resolve provider-specific API key without exposing the value."""
+
+    return _first_env(meta.api_env_names) or ""
 
-def _normalise_base_url(provider: str, base_url: str | None, meta: Dict[str, str | List[str] | None]) -> str | None:
+
+def _normalise_base_url(provider: str, base_url: str | None, meta: ProviderMeta) -> str | None:
     # 日本語: ベースURLの不整合を補正 / English: Normalize base URL per provider
     """Clamp base_url to the expected host/path for each provider to avoid stale values."""
 
-    default_base = meta.get("default_base_url")
-    if not isinstance(default_base, str):
-        default_base = None
+    default_base = meta.default_base_url
+
+    # 日本語: 未指定(最頻ケース)はプロバイダ既定値へ直行 / English: Fast path for the common empty-input case straight to the default
+    cleaned = base_url.strip() if base_url else ""
+    if not cleaned:
+        return _safe_base_url_or_default(None, default_base)
 
-    cleaned = (base_url or "").strip()
     if provider == "gemini":
-        target = cleaned or default_base or ""
-        if not target:
-            return None
+        target = cleaned
         lower = target.lower()
         if "generativelanguage.googleapis.com" in lower and "/openai" not in lower:
             target = target.rstrip("/") + "/openai"
@@ -251,14 +278,12 @@ def _normalise_base_url(provider: str, base_url: str | None, meta: Dict[str, str
         return _safe_base_url_or_default(target, default_base)
 
     if provider == "groq":
-        target = cleaned or default_base or ""
-        if target and "groq" not in target.lower():
+        target = cleaned
+        if "groq" not in target.lower():
             target = default_base or target
         return _safe_base_url_or_default(target, default_base)
 
     if provider == "openai":
-        if not cleaned:
-            return _safe_base_url_or_default(None, default_base)
         lowered = cleaned.lower()
         # Drop stale base URLs that point to non-OpenAI hosts, even though they may contain
         # an `/openai` path segment (e.g. Gemini's compatibility endpoint).
@@ -266,44 +291,22 @@ def _normalise_base_url(provider: str, base_url: str | None, meta: Dict[str, str
             return _safe_base_url_or_default(None, default_base)
         return _safe_base_url_or_default(cleaned, default_base)
 
-    # Claude and other providers keep the explicit override or default as-is
-    target = cleaned or default_base or ""
-    return _safe_base_url_or_default(target, default_base)
+    # Claude and other providers keep the explicit override as-is
+    return _safe_base_url_or_default(cleaned, default_base)
 
 
 def normalise_provider_base_url(provider: str, base_url: str | None) -> str | None:
     # 日本語: 外部から利用するbase_url正規化関数 / English: Public provider-aware base_url normalization
     provider_key = provider.strip().lower() if isinstance(provider, str) else "openai"
-    meta = PROVIDER_DEFAULTS.get(provider_key, PROVIDER_DEFAULTS["openai"])
+    meta = _PROVIDER_META.get(provider_key) or _PROVIDER_META["openai"]
     return _normalise_base_url(provider_key, base_url, meta)
 
 
-def _resolve_base_url(meta: Dict[str, str | List[str] | None]) -> str | None:
+def _resolve_base_url(meta: ProviderMeta) -> str | None:
     # 日本語: base_url の環境変数オーバーライド / English: Resolve base URL override from env
     """Resolve base URL override for non-OpenAI providers. Returns None if using default."""
 
-    env_names: List[str] = []
-    base_env = meta.get("base_url_env")
-    aliases = meta.get("base_url_env_aliases") or []
-    if isinstance(base_env, str):
-        env_names.append(base_env)
-        env_names.append(base_env.lower())
-    if isinstance(aliases, list):
-        for alias in aliases:
-            if isinstance(alias, str):
-                env_names.append(alias)
-                env_names.append(alias.lower())
-
-    for env_name in env_names:
-        value = os.getenv(env_name)
-        if value:
-            return value
-
-    default_base = meta.get("default_base_url")
-    if isinstance(default_base, str):
-        return default_base
-
-    return None
+    return _first_env(meta.base_env_names) or meta.default_base_url
 
 
 def apply_model_selection(agent_key: str = "scheduler", override: Dict[str, str] | None = None) -> Tuple[str, str, str | None, str]:
@@ -312,8 +315,8 @@ def apply_model_selection(agent_key: str = "scheduler", override: Dict[str, str]
     provider = selection["provider"]
     model = selection["model"]
 
-    meta = PROVIDER_DEFAULTS.get(provider, PROVIDER_DEFAULTS["openai"])
-    base_candidate = selection.get("base_url") or _resolve_base_url(meta)
+    meta = _PROVIDER_META.get(provider) or _PROVIDER_META["openai"]
+    base_candidate = selection["base_url"] or _resolve_base_url(meta)
     base_url = _normalise_base_url(provider, base_candidate, meta)
     api_key = _resolve_api_key(meta)
 
@@ -8,8 +8,23 @@ from typing import List
 
 from dotenv import load_dotenv
 
+_DOTENV_LOADED = False
+
+
+def _ensure_dotenv() -> None:
+    # 日本語: secrets.env の読み込みはプロセス内で一度だけ / English: Load secrets.env at most once per process
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    # 日本語: 環境変数を直接注入するコンテナ向けにスキップ可能 / English: Allow skipping for containers that inject env directly
+    if not os.getenv("SCHEDULER_SKIP_DOTENV"):
+        # 日本語: 既存の環境変数は上書きしない / English: Never overwrite variables that are already set
+        load_dotenv("secrets.env", override=False, verbose=False)
+    _DOTENV_LOADED = True
+
+
 # 日本語: ルート直下の secrets.env を起動時に読み込む / English: Load root-level secrets.env on startup
-load_dotenv("secrets.env")
+_ensure_dotenv()
 
 # 日本語: プロジェクトルート基準パス / English: Project root directory
 BASE_DIR = Path(__file__).resolve().parents[2]
@@ -2,7 +2,7 @@
 
 import datetime
 
-from sqlalchemy import Column, Text
+from sqlalchemy import Column, Index, Text, UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -41,9 +41,21 @@ class Step(SQLModel, table=True):
 # 日本語: 日付単位で保持するステップ実行ログ / English: Per-day completion log for routine steps
 class DailyLog(SQLModel, table=True):
     __tablename__ = "daily_log"
+    # 日本語: 同一ステップ・同一日のログは1行のみ。一意索引を (step_id, date) 順にして step_id IN + 期間のログ検索も兼ね、PostgreSQL では参照列を INCLUDE して index-only scan にする / English: One log row per step per day; ordering the unique index as (step_id, date) lets it also serve step_id IN + date-range lookups, and on PostgreSQL the read columns are INCLUDEd for index-only scans
+    # 日本語: (guest_id, date) はゲスト内の日付範囲集計用。guest_id 単独の検索もその先頭列で賄う / English: (guest_id, date) serves per-guest date-range scans and covers guest_id-only lookups by its leading column
+    __table_args__ = (
+        Index(
+            "ix_daily_log_step_date",
+            "step_id",
+            "date",
+            unique=True,
+            postgresql_include=["guest_id", "done", "memo"],
+        ),
+        Index("ix_daily_log_guest_date", "guest_id", "date"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
-    guest_id: str = Field(default="default", max_length=64, nullable=False, index=True)
+    guest_id: str = Field(default="default", max_length=64, nullable=False)
     date: datetime.date
     step_id: int = Field(foreign_key="step.id")
     done: bool = Field(default=False)
@@ -56,9 +68,11 @@ class DailyLog(SQLModel, table=True):
 # 日本語: 任意日に追加する単発タスク / English: One-off custom task bound to a specific date
 class CustomTask(SQLModel, table=True):
     __tablename__ = "custom_task"
+    # 日本語: ゲスト内の日付範囲検索と日時順ソート用。guest_id 単独の検索もその先頭列で賄う / English: Serves per-guest date-range lookups ordered by date and time, and guest_id-only lookups by its leading column
+    __table_args__ = (Index("ix_custom_task_guest_date_time", "guest_id", "date", "time"),)
 
     id: int | None = Field(default=None, primary_key=True)
-    guest_id: str = Field(default="default", max_length=64, nullable=False, index=True)
+    guest_id: str = Field(default="default", max_length=64, nullable=False)
     date: datetime.date
     name: str = Field(max_length=100)
     time: str = Field(default="00:00", max_length=10)
@@ -70,9 +84,11 @@ class CustomTask(SQLModel, table=True):
 # 日本語: 1日全体の自由記述メモ / English: Free-form day-level journal entry
 class DayLog(SQLModel, table=True):
     __tablename__ = "day_log"
+    # 日本語: ゲストごとに1日1件。guest_id 単独の検索もこの一意制約の先頭列で賄う / English: One entry per guest per day; the unique constraint's leading column also serves guest_id-only lookups
+    __table_args__ = (UniqueConstraint("guest_id", "date", name="uq_day_log_guest_date"),)
 
     id: int | None = Field(default=None, primary_key=True)
-    guest_id: str = Field(default="default", max_length=64, nullable=False, index=True)
+    guest_id: str = Field(default="default", max_length=64, nullable=False)
     date: datetime.date
     content: str | None = Field(default=None, sa_column=Column(Text))
     created_at: datetime.datetime = Field(default_factory=datetime.datetime.now, nullable=False)
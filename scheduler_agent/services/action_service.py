@@ -5,8 +5,15 @@ from __future__ import annotations
 import datetime
 import json
 import re
-from typing import Any, Dict, List
-
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List
+
+from sqlalchemy import Integer, case, cast, false, func, insert, lambda_stmt, literal_column, null, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from scheduler_tools import SCHEDULER_TOOLS
@@ -25,18 +32,24 @@ from scheduler_agent.services.schedule_parser_service import (
     _requires_date_resolution,
     _try_parse_iso_date,
 )
-from scheduler_agent.services.timeline_service import get_weekday_routines
+from scheduler_agent.services.timeline_service import bucket_routines_by_weekday, date_range_filter
 
 # 日本語: 計算専用で DB を変更しないアクション群 / English: Calculation-only action types that do not mutate DB
-_CALC_ACTION_TYPES = {
-    "calc_date_offset",
-    "calc_month_boundary",
-    "calc_nearest_weekday",
-    "calc_week_weekday",
-    "calc_week_range",
-    "calc_time_offset",
-    "get_date_info",
-}
+_CALC_ACTION_TYPES = frozenset(
+    {
+        "calc_date_offset",
+        "calc_month_boundary",
+        "calc_nearest_weekday",
+        "calc_week_weekday",
+        "calc_week_range",
+        "calc_time_offset",
+        "get_date_info",
+    }
+)
+
+# 日本語: 計算結果行の接頭辞と JSON エンコーダは使い回す / English: Calc result prefixes and the JSON encoder are built once and reused
+_CALC_RESULT_PREFIXES = {action_type: f"計算結果({action_type}): " for action_type in _CALC_ACTION_TYPES}
+_encode_calc_json = json.JSONEncoder(ensure_ascii=False).encode
 
 # 日本語: 参照系（副作用なし）アクション群 / English: Read-only action types with no persistent mutation
 READ_ONLY_ACTION_TYPES = _CALC_ACTION_TYPES | {
@@ -68,92 +81,1430 @@ _ALLOWED_ACTION_TYPES = frozenset(_extract_allowed_action_types(SCHEDULER_TOOLS)
 
 
 # 日本語: 「全件削除」判定に使う語彙セット / English: Tokens interpreted as delete-all routine intent
-_DELETE_ALL_ROUTINE_TOKENS = {
-    "all",
-    "allroutine",
-    "allroutines",
-    "全部",
-    "すべて",
-    "全て",
-    "全件",
-    "全ルーチン",
-    "全ルーティン",
-    "すべてのルーチン",
-    "すべてのルーティン",
-    "全部のルーチン",
-    "全部のルーティン",
-}
+_DELETE_ALL_ROUTINE_TOKENS = frozenset(
+    {
+        "all",
+        "allroutine",
+        "allroutines",
+        "全部",
+        "すべて",
+        "全て",
+        "全件",
+        "全ルーチン",
+        "全ルーティン",
+        "すべてのルーチン",
+        "すべてのルーティン",
+        "全部のルーチン",
+        "全部のルーティン",
+    }
+)
 
 _ROUTINE_NAME_SUFFIXES = ("ルーチン", "ルーティン", "routine", "routines")
+# 日本語: 末尾の「(の)接尾辞」を1回の検索で捉える / English: Capture a trailing "(の)suffix" in a single search
+_ROUTINE_NAME_SUFFIX_RE = re.compile(
+    "(の?)(?:" + "|".join(re.escape(suffix) for suffix in _ROUTINE_NAME_SUFFIXES) + ")$"
+)
+# 日本語: ルーチン名正規化で除去する引用符と空白パターン / English: Quote characters and whitespace pattern stripped during routine-name normalization
+_ROUTINE_NAME_QUOTES = "「」『』\"'`"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def _normalize_routine_name_text(value: str) -> str:
+    # 日本語: 文字列専用の正規化本体(同名の再正規化をキャッシュで省略) / English: String-only normalization body, cached so repeated names are not re-normalized
+    # 日本語: 全角空白 (U+3000) も \s に含まれるため個別の置換は不要 / English: \s already matches the ideographic space (U+3000), so no separate replace is needed
+    text = value.strip().strip(_ROUTINE_NAME_QUOTES)
+    if text.isascii():
+        # 日本語: ASCII 名は split/join と lower で足りる(casefold と同結果) / English: ASCII names only need split/join and lower, which match casefold there
+        return "".join(text.split()).lower()
+    return _WHITESPACE_RE.sub("", text).casefold()
 
 
 def _normalize_routine_name_key(value: Any) -> str:
     # 日本語: ルーチン名比較のため空白/引用符を除去して正規化 / English: Normalize routine-name key for tolerant matching
     if not isinstance(value, str):
         return ""
-    text = value.strip().strip("「」『』\"'`")
-    text = text.replace("　", " ")
-    return re.sub(r"\s+", "", text).casefold()
+    return _normalize_routine_name_text(value)
 
 
-def _routine_name_candidates(value: Any) -> List[str]:
+@lru_cache(maxsize=1024)
+def _routine_name_candidates_for_key(base: str) -> tuple[str, ...]:
+    # 日本語: 正規化済みキーから接尾辞違いの候補を生成(キャッシュ) / English: Build cached suffix-variant candidates from a normalized key
+    match = _ROUTINE_NAME_SUFFIX_RE.search(base)
+    if match is None:
+        return (base,)
+    # 日本語: 接尾辞のみ除去した形と「の+接尾辞」を除去した形(空文字は除外) / English: Strip the bare suffix and the "の+suffix" form, dropping empty remainders
+    candidates = [base, base[: match.end(1)], base[: match.start(1)]]
+    return tuple(dict.fromkeys(item for item in candidates if item))
+
+
+def _routine_name_candidates(value: Any) -> tuple[str, ...]:
     # 日本語: 「◯◯ルーチン」等の接尾辞違いを候補化 / English: Build candidate names by stripping common suffix variants
     base = _normalize_routine_name_key(value)
     if not base:
-        return []
-    candidates = {base}
-    for suffix in _ROUTINE_NAME_SUFFIXES:
-        if base.endswith(suffix) and len(base) > len(suffix):
-            candidates.add(base[: -len(suffix)])
-        suffix_with_no = f"の{suffix}"
-        if base.endswith(suffix_with_no) and len(base) > len(suffix_with_no):
-            candidates.add(base[: -len(suffix_with_no)])
-    return [item for item in candidates if item]
+        return ()
+    return _routine_name_candidates_for_key(base)
+
+
+@lru_cache(maxsize=1024)
+def _partial_name_search(candidates: tuple[str, ...]) -> Callable[[str], Any]:
+    # 日本語: 候補群の部分一致判定を1本の正規表現にまとめ、候補タプルごとにキャッシュ / English: Fold the candidates' partial-match test into one alternation, cached per candidate tuple
+    return re.compile("|".join(re.escape(candidate) for candidate in candidates)).search
 
 
 def _is_delete_all_routine_request(action: Dict[str, Any], routine_name: Any) -> bool:
     # 日本語: all/scope/name いずれでも全削除指示を検出 / English: Detect delete-all intent from all/scope/name fields
     if _bool_from_value(action.get("all"), False):
         return True
-    scope_key = _normalize_routine_name_key(action.get("scope"))
-    if scope_key and scope_key in _DELETE_ALL_ROUTINE_TOKENS:
+    scope = action.get("scope")
+    if scope and _normalize_routine_name_key(scope) in _DELETE_ALL_ROUTINE_TOKENS:
         return True
     name_key = _normalize_routine_name_key(routine_name)
     return bool(name_key and name_key in _DELETE_ALL_ROUTINE_TOKENS)
 
 
-def _match_routines_by_name(routines: List[Routine], routine_name: Any) -> tuple[List[Routine], str]:
+def _match_routines_by_name(
+    routines: List[Routine],
+    routine_name: Any,
+    name_keys: List[str] | None = None,
+) -> tuple[List[Routine], str]:
     # 日本語: 完全一致優先、次に部分一致で候補検索 / English: Match routine names by exact first, then partial fallback
     candidates = _routine_name_candidates(routine_name)
     if not candidates:
         return [], "none"
 
-    normalized_pairs = [
-        (routine, _normalize_routine_name_key(getattr(routine, "name", "")))
-        for routine in routines
-    ]
+    if name_keys is None:
+        # 日本語: 呼び出し側に正規化済みキーがなければここで算出 / English: Normalize names here unless the caller supplies precomputed keys
+        name_keys = [_normalize_routine_name_key(getattr(routine, "name", "")) for routine in routines]
+    normalized_pairs = list(zip(routines, name_keys))
 
     # 日本語: 重複名を考慮して ID 単位で一意化 / English: Deduplicate matches by routine ID
+    candidate_set = frozenset(candidates)
     exact_by_id: Dict[int, Routine] = {}
-    for candidate in candidates:
-        for routine, name_key in normalized_pairs:
-            if name_key == candidate:
-                exact_by_id[routine.id] = routine
+    for routine, name_key in normalized_pairs:
+        if name_key in candidate_set:
+            exact_by_id[routine.id] = routine
     exact_matches = list(exact_by_id.values())
     if exact_matches:
         return exact_matches, "exact"
 
-    partial_by_id: Dict[int, Routine] = {}
-    for candidate in candidates:
-        for routine, name_key in normalized_pairs:
-            if candidate and candidate in name_key:
-                partial_by_id[routine.id] = routine
+    # 日本語: 候補が複数なら1本の正規表現でまとめて部分一致判定 / English: With several candidates, test every partial match with one compiled alternation
+    if len(candidates) == 1:
+        needle = candidates[0]
+        hits = [routine for routine, name_key in normalized_pairs if needle in name_key]
+    else:
+        search = _partial_name_search(candidates)
+        hits = [routine for routine, name_key in normalized_pairs if search(name_key)]
+    partial_by_id: Dict[int, Routine] = {routine.id: routine for routine in hits}
     partial_matches = list(partial_by_id.values())
     if partial_matches:
         return partial_matches, "partial"
 
     return [], "none"
 
+
+# 日本語: ルーチン/ステップ構成を変えるためキャッシュを破棄すべきアクション群(delete_routine はキャッシュから自前で除去) / English: Action types that reshape routines/steps and invalidate the routine caches (delete_routine prunes the cache itself)
+_ROUTINE_MUTATING_ACTION_TYPES = frozenset(
+    {
+        "add_routine",
+        "update_routine_days",
+        "add_step",
+        "delete_step",
+        "update_step_time",
+        "rename_step",
+        "update_step_memo",
+    }
+)
+
+# 日本語: ルーチン展開時に steps を一括ロードするオプション / English: Loader option that batch-loads steps when expanding routines
+_ROUTINE_STEPS_LOADER = (selectinload(Routine.steps),)
+
+
+def _load_daily_log_index(
+    db: Session,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    step_ids: set[int],
+    guest_id: str,
+) -> Dict[tuple[datetime.date, int], Row]:
+    # 日本語: 期間内のステップログを1クエリで取得し (日付, step_id) で索引化 / English: Fetch step logs for a range in one query, keyed by (date, step_id)
+    if not step_ids:
+        return {}
+    # 日本語: 半開区間の上端はラムダ外で計算(9999-12-31 は上限に丸める) / English: Compute the half-open upper bound outside the lambda (clamped at 9999-12-31)
+    end_before = end_date + datetime.timedelta(days=1) if end_date < datetime.date.max else end_date
+    # 日本語: 表示に必要な列だけを軽量な Row で取得し ORM 生成を省く。lambda_stmt で文の構築・キャッシュキー計算も省く / English: Fetch only the displayed columns as lightweight rows; lambda_stmt also skips rebuilding the statement and its cache key
+    logs = db.exec(
+        lambda_stmt(
+            lambda: select(DailyLog.date, DailyLog.step_id, DailyLog.done, DailyLog.memo).where(
+                DailyLog.date >= start_date,
+                DailyLog.date < end_before,
+                DailyLog.step_id.in_(step_ids),
+                DailyLog.guest_id == guest_id,
+            )
+        )
+    ).all()
+    return {(log.date, log.step_id): log for log in logs}
+
+
+def _dialect_insert(db: Session, model: Any) -> Any:
+    # 日本語: ON CONFLICT 対応の insert を接続先方言に合わせて選択 / English: Pick the ON CONFLICT-capable insert construct for the bound dialect
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    return insert(model)
+
+
+def _execute_upsert(db: Session, statement: Any, model: Any) -> Any:
+    # 日本語: 既にセッションにある行も最新値で上書きして返す / English: Return the upserted row, refreshing any copy already held by the session
+    return db.exec(
+        statement.returning(model), execution_options={"populate_existing": True}
+    ).scalar_one()
+
+
+def _upsert_daily_log(
+    db: Session,
+    guest_id: str,
+    date_value: datetime.date,
+    step_id: int,
+    *,
+    done: bool,
+    memo: str | None,
+    created_at: datetime.datetime | None = None,
+) -> DailyLog:
+    # 日本語: (date, step_id) 一意制約を使い SELECT なしで upsert / English: Upsert on the (date, step_id) unique key without a prior SELECT
+    values: Dict[str, Any] = {
+        "guest_id": guest_id,
+        "date": date_value,
+        "step_id": step_id,
+        "done": done,
+        "created_at": created_at or datetime.datetime.now(),
+    }
+    updates: Dict[str, Any] = {"done": done}
+    if memo is not None:
+        # 日本語: memo 未指定時は既存メモを保持 / English: Keep the existing memo when none is supplied
+        values["memo"] = memo
+        updates["memo"] = memo
+    statement = _dialect_insert(db, DailyLog).values(**values)
+    statement = statement.on_conflict_do_update(index_elements=["date", "step_id"], set_=updates)
+    return _execute_upsert(db, statement, DailyLog)
+
+
+def _upsert_day_log(
+    db: Session,
+    guest_id: str,
+    date_value: datetime.date,
+    content: str,
+    *,
+    append: bool,
+    created_at: datetime.datetime | None = None,
+) -> DayLog:
+    # 日本語: (guest_id, date) 一意制約で日報を上書き/追記。追記の連結は DB 側で行う / English: Overwrite or append a day log on the (guest_id, date) key; appends concatenate in SQL
+    values = {
+        "guest_id": guest_id,
+        "date": date_value,
+        "content": content,
+        "created_at": created_at or datetime.datetime.now(),
+    }
+    statement = _dialect_insert(db, DayLog).values(**values)
+    new_content = statement.excluded.content
+    if append:
+        current = DayLog.__table__.c.content
+        new_content = case(
+            (func.coalesce(current, "") == "", new_content),
+            else_=current + "\n" + new_content,
+        )
+    statement = statement.on_conflict_do_update(
+        index_elements=["guest_id", "date"], set_={"content": new_content}
+    )
+    return _execute_upsert(db, statement, DayLog)
+
+
+@dataclass
+class _ActionContext:
+    """Mutable state shared by action handlers during one batch."""
+
+    db: Session
+    default_date: datetime.date
+    guest_id: str
+    # 日本語: バッチ開始時刻を1回だけ取得して各アクションで共有 / English: Batch start time, captured once and shared by every action
+    now: datetime.datetime = field(default_factory=datetime.datetime.now)
+    results: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    modified_ids: List[str] = field(default_factory=list)
+    dirty: bool = False
+    # 日本語: ゲストの全ルーチンは同一バッチ内で1回だけ取得 / English: The guest's routines are fetched at most once per batch
+    routines: List[Routine] | None = None
+    # 日本語: routines と並ぶ正規化済みルーチン名キー / English: Normalized routine-name keys parallel to routines
+    routine_name_keys: List[str] | None = None
+    # 日本語: routines から導出する曜日別バケット / English: Weekday buckets derived from routines
+    weekday_routines: Dict[int, List[Routine]] | None = None
+    # 日本語: 先読み行を強参照で保持し identity map から落ちないようにする / English: Strong refs keep prefetched rows alive in the identity map
+    prefetched: List[Any] = field(default_factory=list)
+    # 日本語: 参照系アクションの出力 (results, errors)。更新系が走るたびに破棄 / English: Outputs (results, errors) of read-only actions, dropped whenever a mutating action runs
+    read_outputs: Dict[tuple[str, str], tuple[List[str], List[str]]] = field(default_factory=dict)
+    # 日本語: 日付→日報(未存在は None)。upsert 結果で随時更新 / English: Date → DayLog (None when absent), kept current by the upserts
+    day_logs: Dict[datetime.date, DayLog | None] = field(default_factory=dict)
+
+
+@lru_cache(maxsize=4096)
+def _routine_item_id(step_id: int) -> str:
+    # 日本語: ルーチンステップの UI 要素 ID を主キーごとに1回だけ生成 / English: Build a routine step's UI element id once per primary key
+    return f"item_routine_{step_id}"
+
+
+@lru_cache(maxsize=4096)
+def _custom_item_id(task_id: int) -> str:
+    # 日本語: カスタムタスクの UI 要素 ID を主キーごとに1回だけ生成 / English: Build a custom task's UI element id once per primary key
+    return f"item_custom_{task_id}"
+
+
+def _coerce_pk(value: Any) -> int | None:
+    # 日本語: 主キー値を int 化。JSON 数値(int)はそのまま返し例外処理を通さない / English: Coerce a primary-key value to int; plain ints from JSON skip the exception path
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _stripped_str(value: Any, default: str = "") -> str:
+    # 日本語: 文字列なら前後空白を除いて返し、それ以外は既定値 / English: Return a string field stripped, or the default for non-string values
+    return value.strip() if isinstance(value, str) else default
+
+
+# 日本語: action 内の ID フィールドと対応モデル / English: Action ID fields and the model each one references
+_PREFETCH_ID_FIELDS = (
+    (CustomTask, "task_id"),
+    (Step, "step_id"),
+    (Routine, "routine_id"),
+)
+
+
+# 日本語: 検証済み (正規化済み type, action) の組。type 不正は空文字 / English: Pre-validated (normalized type, action) pairs; an invalid type becomes ""
+_TypedAction = tuple[str, Dict[str, Any]]
+
+
+def _typed_actions(actions: List[Any]) -> List[_TypedAction]:
+    # 日本語: dict 以外を除外し type の検証・strip をバッチ先頭で1回だけ行う / English: Drop non-dicts and validate/strip each type once at the top of the batch
+    typed: List[_TypedAction] = []
+    for action in actions:
+        if not isinstance(action, dict):
+            continue
+        action_type = action.get("type")
+        typed.append((action_type.strip() if isinstance(action_type, str) else "", action))
+    return typed
+
+
+def _prefetch_referenced_rows(ctx: _ActionContext, typed_actions: List[_TypedAction]) -> None:
+    # 日本語: バッチ内で参照される行をモデルごとに IN 1回で取得し、後続の db.get を identity map で解決 / English: Load rows referenced by the batch with one IN query per model so later db.get calls hit the identity map
+    ids_by_field: Dict[str, set[int]] = {field_name: set() for _, field_name in _PREFETCH_ID_FIELDS}
+    deletes_routines = False
+    for action_type, action in typed_actions:
+        if action_type not in _KNOWN_ACTION_TYPES:
+            continue
+        deletes_routines = deletes_routines or action_type == "delete_routine"
+        for field_name, ids in ids_by_field.items():
+            pk = _coerce_pk(action.get(field_name))
+            if pk is not None:
+                ids.add(pk)
+    for model, field_name in _PREFETCH_ID_FIELDS:
+        ids = ids_by_field[field_name]
+        if ids:
+            statement = select(model).where(model.id.in_(ids), model.guest_id == ctx.guest_id)
+            if model is Routine and deletes_routines:
+                # 日本語: カスケード削除が steps をルーチンごとに遅延ロードしないよう IN 1回で先読み / English: Preload steps with one IN query so the delete cascade does not lazy-load them per routine
+                statement = statement.options(*_ROUTINE_STEPS_LOADER)
+            ctx.prefetched.extend(ctx.db.exec(statement).all())
+
+
+def _guest_routines(ctx: _ActionContext) -> List[Routine]:
+    # 日本語: ゲストの全ルーチン(steps 込み)を遅延ロードしてキャッシュ / English: Lazily load and cache the guest's routines together with their steps
+    if ctx.routines is None:
+        ctx.routines = list(
+            ctx.db.exec(
+                select(Routine)
+                .where(Routine.guest_id == ctx.guest_id)
+                .options(*_ROUTINE_STEPS_LOADER)
+            ).all()
+        )
+    return ctx.routines
+
+
+# 日本語: 日報を書き込むアクション群(upsert の RETURNING でキャッシュを更新) / English: Action types that write the day log (their upsert RETURNING refreshes the cache)
+_DAY_LOG_WRITE_ACTION_TYPES = frozenset({"update_log", "append_day_log"})
+
+
+def _prefetch_day_logs(ctx: _ActionContext, typed_actions: List[_TypedAction]) -> None:
+    # 日本語: get_day_log が読む日付の日報を IN 1回で取得 / English: Load the day logs that get_day_log will read with one IN query
+    # 日本語: 書き込みは SELECT 不要の upsert、日次サマリーは UNION ALL で日報も同時取得するため対象外。先行する書き込みで埋まる日付も除外 / English: Writes are SELECT-free upserts and summaries fetch the day log in their UNION ALL, so neither needs it; dates an earlier write fills are skipped too
+    dates: set[datetime.date] = set()
+    written: set[datetime.date] = set()
+    for action_type, action in typed_actions:
+        if action_type != "get_day_log" and action_type not in _DAY_LOG_WRITE_ACTION_TYPES:
+            continue
+        raw_date_value = action.get("date")
+        if _requires_date_resolution(raw_date_value):
+            continue
+        date_value = _parse_date(raw_date_value, ctx.default_date)
+        if action_type in _DAY_LOG_WRITE_ACTION_TYPES:
+            written.add(date_value)
+        elif date_value not in written:
+            dates.add(date_value)
+    if len(dates) < 2:
+        # 日本語: 1日分なら個別取得と同じなので先読みしない / English: A single date costs the same either way, so skip the prefetch
+        return
+    ctx.day_logs.update(dict.fromkeys(dates))
+    for day_log in ctx.db.exec(
+        select(DayLog).where(DayLog.date.in_(dates), DayLog.guest_id == ctx.guest_id)
+    ).all():
+        ctx.day_logs[day_log.date] = day_log
+
+
+def _get_day_log(ctx: _ActionContext, date_value: datetime.date) -> DayLog | None:
+    # 日本語: 日報をキャッシュ経由で取得し、未取得の日付のみ問い合わせ / English: Fetch a day log through the cache, querying only for unseen dates
+    if date_value not in ctx.day_logs:
+        ctx.day_logs[date_value] = ctx.db.exec(
+            select(DayLog).where(DayLog.date == date_value, DayLog.guest_id == ctx.guest_id)
+        ).first()
+    return ctx.day_logs[date_value]
+
+
+def _guest_routine_name_keys(ctx: _ActionContext) -> List[str]:
+    # 日本語: キャッシュ済みルーチンの正規化名をバッチ内で1回だけ算出 / English: Normalize the cached routines' names once per batch
+    routines = _guest_routines(ctx)
+    if ctx.routine_name_keys is None:
+        ctx.routine_name_keys = [_normalize_routine_name_key(routine.name) for routine in routines]
+    return ctx.routine_name_keys
+
+
+def _weekday_routines(ctx: _ActionContext) -> Dict[int, List[Routine]]:
+    # 日本語: 曜日別ルーチンをキャッシュ済みルーチンから構築 / English: Build weekday buckets from the cached routine list
+    if ctx.weekday_routines is None:
+        ctx.weekday_routines = bucket_routines_by_weekday(_guest_routines(ctx))
+    return ctx.weekday_routines
+
+
+def _invalidate_routine_cache(ctx: _ActionContext) -> None:
+    # 日本語: ルーチン構成が変わったらキャッシュを破棄 / English: Drop the routine caches once routines change shape
+    ctx.routines = None
+    ctx.routine_name_keys = None
+    ctx.weekday_routines = None
+
+
+def _forget_routines(ctx: _ActionContext, deleted: List[Routine]) -> None:
+    # 日本語: 削除したルーチンだけをキャッシュから除き、再クエリを避ける / English: Prune deleted routines from the cache instead of re-querying
+    if ctx.routines is not None:
+        deleted_ids = {id(routine) for routine in deleted}
+        if ctx.routine_name_keys is not None:
+            ctx.routine_name_keys = [
+                name_key
+                for routine, name_key in zip(ctx.routines, ctx.routine_name_keys)
+                if id(routine) not in deleted_ids
+            ]
+        ctx.routines = [routine for routine in ctx.routines if id(routine) not in deleted_ids]
+    ctx.weekday_routines = None
+
+
+def _get_owned(ctx: _ActionContext, model: Any, pk: int) -> Any:
+    # 日本語: 主キー取得(identity map 経由)し、他ゲストの行は None 扱い / English: Fetch by primary key via the identity map, hiding rows owned by other guests
+    # 日本語: 同じ主キーの2回目以降は identity map が SQL なしで返す。独自辞書を重ねると delete やカスケード削除後の行を返しうるため持たない / English: Repeat lookups are answered by the identity map without SQL; a separate dict would risk handing back rows removed by delete or cascade
+    obj = ctx.db.get(model, pk)
+    if obj is None or obj.guest_id != ctx.guest_id:
+        return None
+    return obj
+
+
+# ---------- 原子的計算ツール ----------
+# English: Atomic calc tools (no DB write)
+# 日本語: calc 種別 → 純粋な計算関数 / English: Calc action type → pure calculation function
+_CALC_FUNCTIONS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "calc_date_offset": _calc_date_offset,
+    "calc_month_boundary": _calc_month_boundary,
+    "calc_nearest_weekday": _calc_nearest_weekday,
+    "calc_week_weekday": _calc_week_weekday,
+    "calc_week_range": _calc_week_range,
+    "calc_time_offset": _calc_time_offset,
+    "get_date_info": _get_date_info,
+}
+
+
+@lru_cache(maxsize=1024)
+def _cached_calc_output(action_type: str, args: tuple[Any, ...]) -> tuple[bool, str]:
+    # 日本語: 計算は入力だけで決まるため、整形済みの結果行を引数ごとにキャッシュ / English: Calcs depend only on their inputs, so the formatted output line is cached per argument tuple
+    calc = _CALC_FUNCTIONS[action_type](*args)
+    if not calc.get("ok"):
+        return False, f"{action_type}: {calc.get('error')}"
+    return True, _CALC_RESULT_PREFIXES[action_type] + _encode_calc_json(calc)
+
+
+def _append_calc_result(ctx: _ActionContext, action_type: str, *args: Any) -> None:
+    # 日本語: 計算結果を共通書式で結果一覧(失敗時はエラー一覧)へ追加 / English: Append a calc result in the shared format, or its error on failure
+    ok, line = _cached_calc_output(action_type, args)
+    (ctx.results if ok else ctx.errors).append(line)
+
+
+def _act_calc_date_offset(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    base_date_str = action.get("base_date")
+    base_date_val = _try_parse_iso_date(base_date_str)
+    if base_date_val is None:
+        ctx.errors.append("calc_date_offset: base_date が不正です。YYYY-MM-DD で指定してください。")
+        return
+    try:
+        offset = int(action.get("offset_days", 0))
+    except (TypeError, ValueError):
+        ctx.errors.append("calc_date_offset: offset_days が整数ではありません。")
+        return
+    _append_calc_result(ctx, "calc_date_offset", base_date_val, offset)
+
+
+def _act_calc_month_boundary(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    try:
+        year = int(action.get("year", 0))
+        month = int(action.get("month", 0))
+    except (TypeError, ValueError):
+        ctx.errors.append("calc_month_boundary: year/month が整数ではありません。")
+        return
+    boundary = str(action.get("boundary", "")).strip()
+    _append_calc_result(ctx, "calc_month_boundary", year, month, boundary)
+
+
+def _act_calc_nearest_weekday(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    base_date_val = _try_parse_iso_date(action.get("base_date"))
+    if base_date_val is None:
+        ctx.errors.append("calc_nearest_weekday: base_date が不正です。YYYY-MM-DD で指定してください。")
+        return
+    try:
+        weekday = int(action.get("weekday", -1))
+    except (TypeError, ValueError):
+        ctx.errors.append("calc_nearest_weekday: weekday が整数ではありません。")
+        return
+    direction = str(action.get("direction", "")).strip()
+    _append_calc_result(ctx, "calc_nearest_weekday", base_date_val, weekday, direction)
+
+
+def _act_calc_week_weekday(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    base_date_val = _try_parse_iso_date(action.get("base_date"))
+    if base_date_val is None:
+        ctx.errors.append("calc_week_weekday: base_date が不正です。YYYY-MM-DD で指定してください。")
+        return
+    try:
+        week_offset = int(action.get("week_offset", 0))
+        weekday = int(action.get("weekday", -1))
+    except (TypeError, ValueError):
+        ctx.errors.append("calc_week_weekday: week_offset/weekday が整数ではありません。")
+        return
+    _append_calc_result(ctx, "calc_week_weekday", base_date_val, week_offset, weekday)
+
+
+def _act_calc_week_range(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    base_date_val = _try_parse_iso_date(action.get("base_date"))
+    if base_date_val is None:
+        ctx.errors.append("calc_week_range: base_date が不正です。YYYY-MM-DD で指定してください。")
+        return
+    _append_calc_result(ctx, "calc_week_range", base_date_val)
+
+
+def _act_calc_time_offset(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    base_date_val = _try_parse_iso_date(action.get("base_date"))
+    if base_date_val is None:
+        ctx.errors.append("calc_time_offset: base_date が不正です。YYYY-MM-DD で指定してください。")
+        return
+    base_time = str(action.get("base_time", "")).strip()
+    try:
+        offset_min = int(action.get("offset_minutes", 0))
+    except (TypeError, ValueError):
+        ctx.errors.append("calc_time_offset: offset_minutes が整数ではありません。")
+        return
+    _append_calc_result(ctx, "calc_time_offset", base_date_val, base_time, offset_min)
+
+
+def _act_get_date_info(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    date_val = _try_parse_iso_date(action.get("date"))
+    if date_val is None:
+        ctx.errors.append("get_date_info: date が不正です。YYYY-MM-DD で指定してください。")
+        return
+    _append_calc_result(ctx, "get_date_info", date_val)
+
+
+def _act_create_custom_task(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 単発カスタムタスク作成 / English: Create single custom task
+    name = _stripped_str(action.get("name"))
+    if not name:
+        ctx.errors.append("create_custom_task: name が指定されていません。")
+        return
+    raw_date_value = action.get("date")
+    if _requires_date_resolution(raw_date_value):
+        ctx.errors.append(
+            "create_custom_task: date に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日時へ変換してください。"
+        )
+        return
+    raw_time_value = action.get("time")
+    if _requires_date_resolution(raw_time_value):
+        ctx.errors.append(
+            "create_custom_task: time に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日時へ変換してください。"
+        )
+        return
+    date_value = _parse_date(raw_date_value, ctx.default_date)
+    new_task = CustomTask(
+        guest_id=ctx.guest_id,
+        date=date_value,
+        name=name,
+        time=_stripped_str(raw_time_value, "00:00"),
+        memo=_stripped_str(action.get("memo")),
+        created_at=ctx.now,
+    )
+    ctx.db.add(new_task)
+    ctx.db.flush()
+    ctx.results.append(
+        f"カスタムタスク「{new_task.name}」(ID: {new_task.id}) を {date_value} の {new_task.time} に追加しました。"
+    )
+    ctx.modified_ids.append(_custom_item_id(new_task.id))
+    ctx.dirty = True
+
+
+def _act_create_tasks_in_range(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 期間内に同一タスクを日次で一括作成 / English: Bulk-create same task for each date in range
+    task_name = _stripped_str(action.get("name"))
+    if not task_name:
+        ctx.errors.append("create_tasks_in_range: name が指定されていません。")
+        return
+    raw_start = action.get("start_date")
+    raw_end = action.get("end_date")
+    if _requires_date_resolution(raw_start) or _requires_date_resolution(raw_end):
+        ctx.errors.append(
+            "create_tasks_in_range: 日付に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    start_val = _try_parse_iso_date(raw_start)
+    end_val = _try_parse_iso_date(raw_end)
+    if start_val is None or end_val is None:
+        ctx.errors.append("create_tasks_in_range: start_date / end_date が YYYY-MM-DD 形式ではありません。")
+        return
+    if start_val > end_val:
+        ctx.errors.append("create_tasks_in_range: start_date が end_date より後です。")
+        return
+    span = (end_val - start_val).days + 1
+    if span > 365:
+        ctx.errors.append("create_tasks_in_range: 期間が長すぎます（最大365日）。")
+        return
+    task_dates = [start_val + datetime.timedelta(days=offset) for offset in range(span)]
+    # 日本語: 日付以外の列は全行共通なので1つの雛形から複製する / English: Every column but the date is shared, so rows are copied from one template
+    row_template = {
+        "guest_id": ctx.guest_id,
+        "name": task_name,
+        "time": _stripped_str(action.get("time")) or "00:00",
+        "done": False,
+        "memo": _stripped_str(action.get("memo")),
+        "created_at": ctx.now,
+    }
+    # 日本語: 生成 ID は不要なので ORM 一括 INSERT(executemany)1回で登録 / English: Generated IDs are not needed, so insert every row with one ORM bulk INSERT (executemany)
+    ctx.db.exec(
+        insert(CustomTask),
+        params=[dict(row_template, date=task_date) for task_date in task_dates],
+    )
+    ctx.results.append(
+        f"「{task_name}」を {start_val.isoformat()} から {end_val.isoformat()} まで {span} 件登録しました。"
+    )
+    ctx.modified_ids.extend([f"item_custom_{d.isoformat()}" for d in task_dates])
+    ctx.dirty = True
+
+
+def _act_delete_custom_task(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ID指定でカスタムタスク削除 / English: Delete custom task by ID
+    task_id = action.get("task_id")
+    task_id_int = _coerce_pk(task_id)
+    if task_id_int is None:
+        ctx.errors.append("delete_custom_task: task_id が不正です。")
+        return
+    task_obj = _get_owned(ctx, CustomTask, task_id_int)
+    if not task_obj:
+        ctx.errors.append(f"task_id={task_id_int} が見つかりませんでした。")
+        return
+    ctx.db.delete(task_obj)
+    ctx.results.append(f"カスタムタスク「{task_obj.name}」を削除しました。")
+    ctx.dirty = True
+
+
+def _act_delete_tasks_in_range(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 期間内カスタムタスクを一括削除 / English: Delete all custom tasks within date range
+    raw_start = action.get("start_date")
+    raw_end = action.get("end_date")
+    if _requires_date_resolution(raw_start) or _requires_date_resolution(raw_end):
+        ctx.errors.append(
+            "delete_tasks_in_range: 日付に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    start_val = _try_parse_iso_date(raw_start)
+    end_val = _try_parse_iso_date(raw_end)
+    if start_val is None or end_val is None:
+        ctx.errors.append("delete_tasks_in_range: start_date / end_date が YYYY-MM-DD 形式ではありません。")
+        return
+    if start_val > end_val:
+        ctx.errors.append("delete_tasks_in_range: start_date が end_date より後です。")
+        return
+    tasks_to_delete = ctx.db.exec(
+        select(CustomTask)
+        .where(*date_range_filter(CustomTask.date, start_val, end_val), CustomTask.guest_id == ctx.guest_id)
+    ).all()
+    count = len(tasks_to_delete)
+    for t in tasks_to_delete:
+        ctx.db.delete(t)
+    if count > 0:
+        ctx.results.append(
+            f"{start_val.isoformat()} から {end_val.isoformat()} までのカスタムタスク {count} 件を削除しました。"
+        )
+        ctx.modified_ids.append("task-list")
+        ctx.dirty = True
+    else:
+        ctx.results.append(
+            f"{start_val.isoformat()} から {end_val.isoformat()} までに削除対象のタスクはありませんでした。"
+        )
+
+
+def _act_toggle_step(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ルーチンステップの完了/メモ更新 / English: Update completion/memo for routine step
+    step_id = action.get("step_id")
+    step_id_int = _coerce_pk(step_id)
+    if step_id_int is None:
+        ctx.errors.append("toggle_step: step_id が不正です。")
+        return
+    raw_date_value = action.get("date")
+    if _requires_date_resolution(raw_date_value):
+        ctx.errors.append(
+            "toggle_step: date に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    step_obj = _get_owned(ctx, Step, step_id_int)
+    if not step_obj:
+        ctx.errors.append(f"step_id={step_id_int} が見つかりませんでした。")
+        return
+    date_value = _parse_date(raw_date_value, ctx.default_date)
+    memo = action.get("memo")
+    # 日本語: 既存ログの SELECT は行わず (date, step_id) の upsert 1文で反映 / English: No SELECT for the existing log; one (date, step_id) upsert applies the toggle
+    log = _upsert_daily_log(
+        ctx.db,
+        ctx.guest_id,
+        date_value,
+        step_obj.id,
+        done=_bool_from_value(action.get("done"), True),
+        memo=memo.strip() if isinstance(memo, str) else None,
+        created_at=ctx.now,
+    )
+    ctx.results.append(
+        f"ステップ「{step_obj.name}」({date_value}) を {'完了' if log.done else '未完了'} に更新しました。"
+    )
+    ctx.modified_ids.append(_routine_item_id(step_obj.id))
+    ctx.dirty = True
+
+
+def _act_toggle_custom_task(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: カスタムタスクの完了/メモ更新 / English: Update completion/memo for custom task
+    task_id = action.get("task_id")
+    task_id_int = _coerce_pk(task_id)
+    if task_id_int is None:
+        ctx.errors.append("toggle_custom_task: task_id が不正です。")
+        return
+    task_obj = _get_owned(ctx, CustomTask, task_id_int)
+    if not task_obj:
+        ctx.errors.append(f"task_id={task_id_int} が見つかりませんでした。")
+        return
+    task_obj.done = _bool_from_value(action.get("done"), True)
+    memo = action.get("memo")
+    if isinstance(memo, str):
+        task_obj.memo = memo.strip()
+    ctx.results.append(
+        f"カスタムタスク「{task_obj.name}」を {'完了' if task_obj.done else '未完了'} に更新しました。"
+    )
+    ctx.modified_ids.append(_custom_item_id(task_obj.id))
+    ctx.dirty = True
+
+
+def _act_update_custom_task_time(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: カスタムタスク時刻変更 / English: Update custom task time
+    task_id = action.get("task_id")
+    new_time = action.get("new_time")
+    if not new_time:
+        ctx.errors.append("update_custom_task_time: new_time が指定されていません。")
+        return
+    task_id_int = _coerce_pk(task_id)
+    if task_id_int is None:
+        ctx.errors.append("update_custom_task_time: task_id が不正です。")
+        return
+    task_obj = _get_owned(ctx, CustomTask, task_id_int)
+    if not task_obj:
+        ctx.errors.append(f"task_id={task_id_int} が見つかりませんでした。")
+        return
+    task_obj.time = str(new_time).strip()
+    ctx.results.append(f"カスタムタスク「{task_obj.name}」の時刻を {task_obj.time} に更新しました。")
+    ctx.modified_ids.append(_custom_item_id(task_obj.id))
+    ctx.dirty = True
+
+
+def _act_rename_custom_task(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: カスタムタスク名変更 / English: Rename custom task
+    task_id = action.get("task_id")
+    new_name = action.get("new_name")
+    if not new_name:
+        ctx.errors.append("rename_custom_task: new_name が指定されていません。")
+        return
+    task_id_int = _coerce_pk(task_id)
+    if task_id_int is None:
+        ctx.errors.append("rename_custom_task: task_id が不正です。")
+        return
+    task_obj = _get_owned(ctx, CustomTask, task_id_int)
+    if not task_obj:
+        ctx.errors.append(f"task_id={task_id_int} が見つかりませんでした。")
+        return
+    old_name = task_obj.name
+    task_obj.name = str(new_name).strip()
+    ctx.results.append(f"カスタムタスク「{old_name}」の名前を「{task_obj.name}」に更新しました。")
+    ctx.modified_ids.append(_custom_item_id(task_obj.id))
+    ctx.dirty = True
+
+
+def _act_update_custom_task_memo(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: カスタムタスクメモ更新 / English: Update custom task memo
+    task_id = action.get("task_id")
+    new_memo = action.get("new_memo")
+    if new_memo is None:
+        ctx.errors.append("update_custom_task_memo: new_memo が指定されていません。")
+        return
+    task_id_int = _coerce_pk(task_id)
+    if task_id_int is None:
+        ctx.errors.append("update_custom_task_memo: task_id が不正です。")
+        return
+    task_obj = _get_owned(ctx, CustomTask, task_id_int)
+    if not task_obj:
+        ctx.errors.append(f"task_id={task_id_int} が見つかりませんでした。")
+        return
+    task_obj.memo = str(new_memo).strip()
+    ctx.results.append(f"カスタムタスク「{task_obj.name}」のメモを更新しました。")
+    ctx.modified_ids.append(_custom_item_id(task_obj.id))
+    ctx.dirty = True
+
+
+def _act_update_log(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 日報を上書き保存 / English: Overwrite day log content
+    content = _stripped_str(action.get("content"))
+    if not content:
+        ctx.errors.append("update_log: content が指定されていません。")
+        return
+    raw_date_value = action.get("date")
+    if _requires_date_resolution(raw_date_value):
+        ctx.errors.append(
+            "update_log: date に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    date_value = _parse_date(raw_date_value, ctx.default_date)
+    ctx.day_logs[date_value] = _upsert_day_log(
+        ctx.db, ctx.guest_id, date_value, content, append=False, created_at=ctx.now
+    )
+    ctx.results.append(f"{date_value} の日報を更新しました。")
+    ctx.modified_ids.append("daily-log-card")
+    ctx.dirty = True
+
+
+def _act_append_day_log(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 既存日報へ追記 / English: Append text to existing day log
+    content = _stripped_str(action.get("content"))
+    if not content:
+        ctx.errors.append("append_day_log: content が指定されていません。")
+        return
+    raw_date_value = action.get("date")
+    if _requires_date_resolution(raw_date_value):
+        ctx.errors.append(
+            "append_day_log: date に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    date_value = _parse_date(raw_date_value, ctx.default_date)
+    ctx.day_logs[date_value] = _upsert_day_log(
+        ctx.db, ctx.guest_id, date_value, content, append=True, created_at=ctx.now
+    )
+    ctx.results.append(f"{date_value} の日報に追記しました。")
+    ctx.modified_ids.append("daily-log-card")
+    ctx.dirty = True
+
+
+def _act_get_day_log(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 日報参照（読み取り専用） / English: Fetch day log (read-only)
+    raw_date_value = action.get("date")
+    if _requires_date_resolution(raw_date_value):
+        ctx.errors.append(
+            "get_day_log: date に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    date_value = _parse_date(raw_date_value, ctx.default_date)
+    day_log = _get_day_log(ctx, date_value)
+    if day_log and day_log.content:
+        ctx.results.append(f"{date_value} の日報:\n{day_log.content}")
+    else:
+        ctx.results.append(f"{date_value} の日報は見つかりませんでした。")
+
+
+def _act_add_routine(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ルーチン追加 / English: Create routine
+    name = action.get("name")
+    if not name:
+        ctx.errors.append("add_routine: name is required")
+        return
+    days = action.get("days", "0,1,2,3,4")
+    desc = action.get("description", "")
+    routine = Routine(
+        guest_id=ctx.guest_id, name=name, days=days, description=desc, created_at=ctx.now
+    )
+    ctx.db.add(routine)
+    ctx.db.flush()
+    ctx.results.append(f"ルーチン「{name}」(ID: {routine.id}) を追加しました。")
+    ctx.dirty = True
+
+
+def _act_delete_routine(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ID/名称/全件指定に対応したルーチン削除 / English: Delete routine by ID, name, or delete-all intent
+    rid = action.get("routine_id")
+    routine_name = action.get("routine_name")
+
+    if rid is not None and str(rid).strip() != "":
+        # 日本語: routine_id があれば最優先で削除 / English: Prioritize explicit routine_id when provided
+        routine_id_int = _coerce_pk(rid)
+        if routine_id_int is None:
+            ctx.errors.append("delete_routine: routine_id が不正です。")
+            return
+        routine_obj = _get_owned(ctx, Routine, routine_id_int)
+        if not routine_obj:
+            ctx.errors.append(f"routine_id={routine_id_int} が見つかりませんでした。")
+            return
+        ctx.db.delete(routine_obj)
+        _forget_routines(ctx, [routine_obj])
+        ctx.results.append(f"ルーチン「{routine_obj.name}」を削除しました。")
+        ctx.dirty = True
+        return
+
+    routines = _guest_routines(ctx)
+
+    # 日本語: 全件指定の判定は ID 指定がない場合だけ行う / English: Only check for delete-all intent when no routine_id was given
+    if _is_delete_all_routine_request(action, routine_name):
+        # 日本語: 全件削除モード / English: Delete-all mode
+        if not routines:
+            ctx.results.append("削除対象のルーチンはありませんでした。")
+            return
+        deleted_count = 0
+        for routine_obj in routines:
+            ctx.db.delete(routine_obj)
+            deleted_count += 1
+        _forget_routines(ctx, list(routines))
+        ctx.results.append(f"ルーチンを{deleted_count}件削除しました。")
+        ctx.dirty = True
+        return
+
+    if not isinstance(routine_name, str) or not routine_name.strip():
+        ctx.errors.append(
+            "delete_routine: routine_id / routine_name / scope=all のいずれかを指定してください。"
+        )
+        return
+
+    matched_routines, match_mode = _match_routines_by_name(
+        routines, routine_name, _guest_routine_name_keys(ctx)
+    )
+    if not matched_routines:
+        ctx.errors.append(
+            f"delete_routine: routine_name='{routine_name.strip()}' に一致するルーチンが見つかりませんでした。"
+        )
+        return
+
+    if match_mode != "exact" and len(matched_routines) > 1:
+        # 日本語: 部分一致が複数ある場合は誤削除防止で停止 / English: Stop on ambiguous partial matches to avoid accidental deletions
+        candidates = "、".join(
+            f"{item.name}(ID:{item.id})" for item in matched_routines[:5]
+        )
+        ctx.errors.append(
+            "delete_routine: routine_name に一致するルーチンが複数あります。"
+            f" 候補: {candidates}。routine_id またはより具体的な routine_name を指定してください。"
+        )
+        return
+
+    for routine_obj in matched_routines:
+        ctx.db.delete(routine_obj)
+    _forget_routines(ctx, matched_routines)
+    deleted_count = len(matched_routines)
+    if deleted_count == 1:
+        ctx.results.append(f"ルーチン「{matched_routines[0].name}」を削除しました。")
+    else:
+        ctx.results.append(
+            f"ルーチン名「{routine_name.strip()}」に一致した {deleted_count} 件を削除しました。"
+        )
+    ctx.dirty = True
+
+
+def _act_update_routine_days(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ルーチンの有効曜日更新 / English: Update routine active weekdays
+    routine_id = action.get("routine_id")
+    new_days = action.get("new_days")
+    if not new_days:
+        ctx.errors.append("update_routine_days: new_days が指定されていません。")
+        return
+    routine_id_int = _coerce_pk(routine_id)
+    if routine_id_int is None:
+        ctx.errors.append("update_routine_days: routine_id が不正です。")
+        return
+    routine_obj = _get_owned(ctx, Routine, routine_id_int)
+    if not routine_obj:
+        ctx.errors.append(f"routine_id={routine_id_int} が見つかりませんでした。")
+        return
+    routine_obj.days = str(new_days).strip()
+    ctx.results.append(f"ルーチン「{routine_obj.name}」の曜日を {routine_obj.days} に更新しました。")
+    ctx.dirty = True
+
+
+def _act_add_step(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ルーチンへステップ追加 / English: Add new step to routine
+    rid = action.get("routine_id")
+    name = action.get("name")
+    if not rid or not name:
+        ctx.errors.append("add_step: routine_id and name required")
+        return
+    routine_id_int = _coerce_pk(rid)
+    if routine_id_int is None:
+        ctx.errors.append("add_step: routine_id が不正です。")
+        return
+    routine_obj = _get_owned(ctx, Routine, routine_id_int)
+    if not routine_obj:
+        ctx.errors.append(f"routine_id={routine_id_int} が見つかりませんでした。")
+        return
+    step = Step(
+        guest_id=ctx.guest_id,
+        routine_id=routine_obj.id,
+        name=name,
+        time=action.get("time", "00:00"),
+        category=action.get("category", "Other"),
+        created_at=ctx.now,
+    )
+    ctx.db.add(step)
+    ctx.db.flush()
+    ctx.results.append(f"ルーチン(ID:{rid})にステップ「{name}」(ID: {step.id}) を追加しました。")
+    ctx.modified_ids.append(_routine_item_id(step.id))
+    ctx.dirty = True
+
+
+def _act_delete_step(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ステップ削除 / English: Delete step by ID
+    sid = action.get("step_id")
+    step_id_int = _coerce_pk(sid) if sid else None
+    step = _get_owned(ctx, Step, step_id_int) if step_id_int is not None else None
+    if step:
+        ctx.db.delete(step)
+        ctx.results.append(f"ステップ「{step.name}」を削除しました。")
+        ctx.dirty = True
+    else:
+        ctx.errors.append("delete_step: not found")
+
+
+def _resolve_step_update(
+    ctx: _ActionContext,
+    action: Dict[str, Any],
+    action_type: str,
+    value_field: str,
+    allow_empty: bool = False,
+) -> tuple[Step, Any] | None:
+    # 日本語: ステップ更新系の入力を DB 参照前にまとめて検証し、対象ステップと新しい値を返す / English: Validate step-update input before touching the DB, returning the target step and new value
+    value = action.get(value_field)
+    if value is None or (not allow_empty and not value):
+        ctx.errors.append(f"{action_type}: {value_field} が指定されていません。")
+        return None
+    step_id_int = _coerce_pk(action.get("step_id"))
+    if step_id_int is None:
+        ctx.errors.append(f"{action_type}: step_id が不正です。")
+        return None
+    step_obj = _get_owned(ctx, Step, step_id_int)
+    if not step_obj:
+        ctx.errors.append(f"step_id={step_id_int} が見つかりませんでした。")
+        return None
+    return step_obj, value
+
+
+def _act_update_step_time(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ステップ時刻更新 / English: Update step time
+    resolved = _resolve_step_update(ctx, action, "update_step_time", "new_time")
+    if resolved is None:
+        return
+    step_obj, new_time = resolved
+    step_obj.time = str(new_time).strip()
+    ctx.results.append(f"ステップ「{step_obj.name}」の時刻を {step_obj.time} に更新しました。")
+    ctx.modified_ids.append(_routine_item_id(step_obj.id))
+    ctx.dirty = True
+
+
+def _act_rename_step(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ステップ名変更 / English: Rename step
+    resolved = _resolve_step_update(ctx, action, "rename_step", "new_name")
+    if resolved is None:
+        return
+    step_obj, new_name = resolved
+    old_name = step_obj.name
+    step_obj.name = str(new_name).strip()
+    ctx.results.append(f"ステップ「{old_name}」の名前を「{step_obj.name}」に更新しました。")
+    ctx.modified_ids.append(_routine_item_id(step_obj.id))
+    ctx.dirty = True
+
+
+def _act_update_step_memo(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: ステップメモ更新 / English: Update step memo
+    resolved = _resolve_step_update(ctx, action, "update_step_memo", "new_memo", allow_empty=True)
+    if resolved is None:
+        return
+    step_obj, new_memo = resolved
+    step_obj.memo = str(new_memo).strip()
+    ctx.results.append(f"ステップ「{step_obj.name}」のメモを更新しました。")
+    ctx.modified_ids.append(_routine_item_id(step_obj.id))
+    ctx.dirty = True
+
+
+def _iter_period_task_lines(
+    custom_tasks: List[Row],
+    step_lines_by_weekday: Dict[int, List[tuple[int, str, str, str]]],
+    log_index: Dict[tuple[datetime.date, int], Row],
+    start_date: datetime.date,
+    span_days: int,
+) -> Iterator[str]:
+    # 日本語: 期間一覧の各行を順に生成し、中間リストを持たずに join へ渡す / English: Yield period listing lines so they feed str.join without an intermediate list
+    # 日本語: タスクは日付順なので日付文字列は日付が変わった時だけ作る / English: Tasks arrive date-ordered, so only rebuild the date label when the date changes
+    label_date, date_label = None, ""
+    for custom_task in custom_tasks:
+        if custom_task.date != label_date:
+            label_date, date_label = custom_task.date, custom_task.date.isoformat()
+        yield (
+            f"カスタムタスク [{custom_task.id}]: {date_label} {custom_task.time} - {custom_task.name} (完了: {custom_task.done}) (メモ: {custom_task.memo or 'なし'})"
+        )
+
+    start_ordinal = start_date.toordinal()
+    start_weekday = start_date.weekday()
+    for offset in range(span_days):
+        # 日本語: 曜日は序数の算術で求め、ルーチンのない日は日付生成ごと省略 / English: Derive weekdays arithmetically and skip days without routines before building a date
+        step_lines = step_lines_by_weekday[(start_weekday + offset) % 7]
+        if not step_lines:
+            continue
+        current_date = datetime.date.fromordinal(start_ordinal + offset)
+        day_label = current_date.isoformat()
+        for step_id, line_head, step_label, default_memo in step_lines:
+            log = log_index.get((current_date, step_id))
+            if log is None:
+                status, memo = "未完了", default_memo
+            else:
+                status, memo = ("完了" if log.done else "未完了"), (log.memo or default_memo)
+            yield f"{line_head}{day_label} {step_label} (完了: {status}) (メモ: {memo})"
+
+
+def _act_list_tasks_in_period(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 期間内のカスタムタスク+ルーチンを横断取得 / English: List both custom tasks and routine steps in date range
+    raw_start_date = action.get("start_date")
+    raw_end_date = action.get("end_date")
+    if _requires_date_resolution(raw_start_date) or _requires_date_resolution(raw_end_date):
+        ctx.errors.append(
+            "list_tasks_in_period: 相対日付が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    start_date = _parse_date(raw_start_date, ctx.default_date)
+    end_date = _parse_date(raw_end_date, ctx.default_date)
+
+    if start_date > end_date:
+        ctx.errors.append("list_tasks_in_period: 開始日が終了日より後です。")
+        return
+
+    # 日本語: 期間内タスクはこの1クエリのみ。並び順は (guest_id, date, time) 索引に沿うため DB 側で付け、日ループでは再取得しない / English: The only CustomTask query for the range; ordering follows the (guest_id, date, time) index, so it stays in SQL and the day loop never re-reads tasks
+    # 日本語: 表示専用なので ORM インスタンスではなく必要列の Row で受け取る / English: Output-only, so fetch the displayed columns as Rows instead of ORM instances
+    custom_tasks = ctx.db.exec(
+        select(
+            CustomTask.id,
+            CustomTask.date,
+            CustomTask.time,
+            CustomTask.name,
+            CustomTask.done,
+            CustomTask.memo,
+        )
+        .where(*date_range_filter(CustomTask.date, start_date, end_date), CustomTask.guest_id == ctx.guest_id)
+        .order_by(CustomTask.date, CustomTask.time)
+    ).all()
+
+    weekday_routines = _weekday_routines(ctx)
+    # 日本語: 期間内に現れる曜日のステップだけログ取得対象にする / English: Only request logs for steps on weekdays present in the range
+    span_days = (end_date - start_date).days + 1
+    start_weekday = start_date.weekday()
+    weekdays_in_range = {(start_weekday + offset) % 7 for offset in range(min(span_days, 7))}
+    # 日本語: 日付に依存しない行の固定部分は曜日ごとに一度だけ組み立てる / English: Pre-format the date-independent part of each step line once per weekday
+    step_lines_by_weekday = {
+        weekday: [
+            (
+                step.id,
+                f"ルーチンステップ [{step.id}]: ",
+                f"{step.time} - {routine.name} - {step.name}",
+                step.memo or "なし",
+            )
+            for routine in weekday_routines[weekday]
+            for step in routine.steps
+        ]
+        for weekday in weekdays_in_range
+    }
+    all_step_ids = {
+        step_line[0] for step_lines in step_lines_by_weekday.values() for step_line in step_lines
+    }
+    log_index = _load_daily_log_index(ctx.db, start_date, end_date, all_step_ids, ctx.guest_id)
+
+    body = "\n".join(
+        _iter_period_task_lines(custom_tasks, step_lines_by_weekday, log_index, start_date, span_days)
+    )
+    if body:
+        ctx.results.append(f"{start_date.isoformat()} から {end_date.isoformat()} までのタスク:\n{body}")
+    else:
+        ctx.results.append(
+            f"{start_date.isoformat()} から {end_date.isoformat()} までのタスクは見つかりませんでした。"
+        )
+
+
+# 日本語: 日次サマリー UNION ALL の行種別 / English: Row kinds in the daily summary UNION ALL
+_SUMMARY_DAY_LOG, _SUMMARY_TASK, _SUMMARY_STEP_LOG = 0, 1, 2
+
+
+def _load_daily_summary_sources(
+    ctx: _ActionContext,
+    target_date: datetime.date,
+    step_ids: set[int],
+) -> tuple[str | None, List[Row], Dict[tuple[datetime.date, int], Row]]:
+    # 日本語: 日報・当日タスク・当日ステップログを UNION ALL 1往復で取得。キャッシュ済みの日報は読み直さない / English: Fetch the day log, the day's tasks and the day's step logs in one UNION ALL round-trip, skipping a day log that is already cached
+    guest_id = ctx.guest_id
+    no_step_id = cast(null(), Integer)
+    branches = [
+        select(
+            literal_column("1", Integer).label("kind"),
+            no_step_id.label("step_id"),
+            CustomTask.name.label("name"),
+            CustomTask.time.label("time"),
+            CustomTask.done.label("done"),
+            CustomTask.memo.label("memo"),
+        ).where(CustomTask.date == target_date, CustomTask.guest_id == guest_id),
+        select(
+            literal_column("2", Integer),
+            DailyLog.step_id,
+            null(),
+            null(),
+            DailyLog.done,
+            DailyLog.memo,
+        ).where(
+            DailyLog.date == target_date,
+            DailyLog.step_id.in_(step_ids),
+            DailyLog.guest_id == guest_id,
+        ),
+    ]
+    if target_date not in ctx.day_logs:
+        branches.append(
+            select(
+                literal_column("0", Integer),
+                no_step_id,
+                DayLog.content,
+                null(),
+                false(),
+                null(),
+            ).where(DayLog.date == target_date, DayLog.guest_id == guest_id)
+        )
+    rows = ctx.db.exec(union_all(*branches)).all()
+
+    day_log_content = None
+    custom_tasks: List[Row] = []
+    log_index: Dict[tuple[datetime.date, int], Row] = {}
+    for row in rows:
+        if row.kind == _SUMMARY_TASK:
+            custom_tasks.append(row)
+        elif row.kind == _SUMMARY_STEP_LOG:
+            log_index[(target_date, row.step_id)] = row
+        else:
+            day_log_content = row.name
+    if target_date in ctx.day_logs:
+        day_log = ctx.day_logs[target_date]
+        day_log_content = day_log.content if day_log else None
+    return day_log_content, custom_tasks, log_index
+
+
+def _iter_daily_summary_lines(
+    day_log_content: str | None,
+    custom_tasks: List[Any],
+    routines_for_day: List[Routine],
+    log_index: Dict[tuple[datetime.date, int], Row],
+    target_date: datetime.date,
+) -> Iterator[str]:
+    # 日本語: 日次サマリーの各行を順に生成し、中間リストを持たずに join へ渡す / English: Yield daily summary lines so they feed str.join without an intermediate list
+    yield f"日報: {day_log_content}" if day_log_content else "日報: なし"
+
+    if custom_tasks:
+        yield "カスタムタスク:"
+        for custom_task in custom_tasks:
+            status = "完了" if custom_task.done else "未完了"
+            yield f"- {custom_task.time} {custom_task.name} ({status}) (メモ: {custom_task.memo or 'なし'})"
+    else:
+        yield "カスタムタスク: なし"
+
+    if not routines_for_day:
+        yield "ルーチンステップ: なし"
+        return
+    yield "ルーチンステップ:"
+    for routine in routines_for_day:
+        # 日本語: ORM 属性の記述子アクセスはルーチンごとに1回だけ行う / English: Resolve the ORM attribute descriptor once per routine rather than per step
+        routine_name = routine.name
+        for step in routine.steps:
+            log = log_index.get((target_date, step.id))
+            status = "完了" if log and log.done else "未完了"
+            memo = (log.memo if log else None) or step.memo or "なし"
+            yield f"- {step.time} {routine_name} - {step.name} ({status}) (メモ: {memo})"
+
+
+def _act_get_daily_summary(ctx: _ActionContext, action: Dict[str, Any]) -> None:
+    # 日本語: 指定日の活動要約を組み立て / English: Build daily activity summary
+    raw_date_value = action.get("date")
+    if _requires_date_resolution(raw_date_value):
+        ctx.errors.append(
+            "get_daily_summary: date に相対表現が含まれています。"
+            " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
+        )
+        return
+    target_date = _parse_date(raw_date_value, ctx.default_date)
+
+    routines_for_day = _weekday_routines(ctx)[target_date.weekday()]
+    day_log_content, custom_tasks, log_index = _load_daily_summary_sources(
+        ctx, target_date, {step.id for routine in routines_for_day for step in routine.steps}
+    )
+    body = "\n".join(
+        _iter_daily_summary_lines(day_log_content, custom_tasks, routines_for_day, log_index, target_date)
+    )
+    ctx.results.append(f"{target_date.isoformat()} の活動概要:\n{body}")
+
+
+def _run_in_savepoint(
+    ctx: _ActionContext,
+    action_type: str,
+    handler: Callable[[_ActionContext, Dict[str, Any]], None],
+    action: Dict[str, Any],
+) -> None:
+    # 日本語: 更新系アクションを SAVEPOINT で包み、失敗時はそのアクション分だけ巻き戻す / English: Wrap a mutating action in a SAVEPOINT so a failure only undoes that action
+    marks = (len(ctx.results), len(ctx.modified_ids), ctx.dirty)
+    savepoint = ctx.db.begin_nested()
+    try:
+        handler(ctx, action)
+        # 日本語: ここで当該アクションの変更だけを flush する。同じアクション内の複数属性変更は unit of work が1つの UPDATE にまとめる。書き込みをバッチ末尾へ遅延させても減るのは同一行を繰り返し編集した場合だけで、アクション単位の巻き戻しを失う / English: This flushes only this action's changes; the unit of work already folds several attribute sets on one row into a single UPDATE. Deferring writes to the end of the batch would only merge repeated edits of the same row, at the cost of per-action rollback
+        savepoint.commit()
+    except Exception as exc:  # noqa: BLE001
+        savepoint.rollback()
+        del ctx.results[marks[0]:]
+        del ctx.modified_ids[marks[1]:]
+        ctx.dirty = marks[2]
+        _invalidate_routine_cache(ctx)
+        ctx.day_logs.clear()
+        ctx.errors.append(f"{action_type}: 操作の適用に失敗しました: {exc}")
+
+
+# 日本語: json.dumps は既定以外の引数だと毎回エンコーダを生成するため1つを使い回す / English: json.dumps builds a new encoder per call for non-default options, so one is reused
+_encode_read_key = json.JSONEncoder(sort_keys=True, ensure_ascii=False, default=str).encode
+
+
+def _run_read_only(
+    ctx: _ActionContext,
+    action_type: str,
+    handler: Callable[[_ActionContext, Dict[str, Any]], None],
+    action: Dict[str, Any],
+) -> None:
+    # 日本語: 同一バッチ内で同じ参照系アクションが繰り返されたら前回の出力を再利用 / English: Reuse the previous output when a batch repeats the same read-only action
+    key = (action_type, _encode_read_key(action))
+    cached = ctx.read_outputs.get(key)
+    if cached is not None:
+        ctx.results.extend(cached[0])
+        ctx.errors.extend(cached[1])
+        return
+    marks = (len(ctx.results), len(ctx.errors))
+    # 日本語: 直前の更新は SAVEPOINT 解放時に flush 済みなので参照系では autoflush を止める / English: Earlier writes were flushed when their savepoint was released, so reads skip autoflush
+    with ctx.db.no_autoflush:
+        handler(ctx, action)
+    ctx.read_outputs[key] = (ctx.results[marks[0]:], ctx.errors[marks[1]:])
+
+
+# 日本語: action type → ハンドラの対応表 / English: Dispatch table mapping action type to handler
+_ACTION_HANDLERS: Dict[str, Callable[[_ActionContext, Dict[str, Any]], None]] = {
+    "calc_date_offset": _act_calc_date_offset,
+    "calc_month_boundary": _act_calc_month_boundary,
+    "calc_nearest_weekday": _act_calc_nearest_weekday,
+    "calc_week_weekday": _act_calc_week_weekday,
+    "calc_week_range": _act_calc_week_range,
+    "calc_time_offset": _act_calc_time_offset,
+    "get_date_info": _act_get_date_info,
+    "create_custom_task": _act_create_custom_task,
+    "create_tasks_in_range": _act_create_tasks_in_range,
+    "delete_custom_task": _act_delete_custom_task,
+    "delete_tasks_in_range": _act_delete_tasks_in_range,
+    "toggle_step": _act_toggle_step,
+    "toggle_custom_task": _act_toggle_custom_task,
+    "update_custom_task_time": _act_update_custom_task_time,
+    "rename_custom_task": _act_rename_custom_task,
+    "update_custom_task_memo": _act_update_custom_task_memo,
+    "update_log": _act_update_log,
+    "append_day_log": _act_append_day_log,
+    "get_day_log": _act_get_day_log,
+    "add_routine": _act_add_routine,
+    "delete_routine": _act_delete_routine,
+    "update_routine_days": _act_update_routine_days,
+    "add_step": _act_add_step,
+    "delete_step": _act_delete_step,
+    "update_step_time": _act_update_step_time,
+    "rename_step": _act_rename_step,
+    "update_step_memo": _act_update_step_memo,
+    "list_tasks_in_period": _act_list_tasks_in_period,
+    "get_daily_summary": _act_get_daily_summary,
+}
+
+# 日本語: 許可リストとハンドラ表を事前に突き合わせ、ループ内の判定を1回の辞書参照にする / English: Pre-intersect the whitelist with the handler table so the loop needs one dict lookup
+_ALLOWED_ACTION_HANDLERS: Dict[str, Callable[[_ActionContext, Dict[str, Any]], None]] = {
+    action_type: handler
+    for action_type, handler in _ACTION_HANDLERS.items()
+    if action_type in _ALLOWED_ACTION_TYPES
+}
+# 日本語: 実行対象になり得る type。未知 type は先読みやバッチ分類から除外する / English: Types that can actually run; unknown types are left out of prefetching and batch classification
+_KNOWN_ACTION_TYPES = frozenset(_ALLOWED_ACTION_HANDLERS)
+
+
+def _is_read_only_batch(typed_actions: List[_TypedAction]) -> bool:
+    # 日本語: 全アクションが参照系かを事前判定 / English: Detect up front whether every action is read-only
+    # 日本語: 未知 type はエラーを返すだけで書き込まないため判定から除外 / English: Unknown types only report an error and never write, so they do not force the mutating path
+    return all(
+        action_type in READ_ONLY_ACTION_TYPES or action_type not in _KNOWN_ACTION_TYPES
+        for action_type, _ in typed_actions
+    )
+
+
+def _dispatch_actions(ctx: _ActionContext, typed_actions: List[_TypedAction]) -> None:
+    # 日本語: ループ内で参照するモジュール定数をローカルに束縛 / English: Bind module-level tables to locals for the hot loop
+    handlers = _ALLOWED_ACTION_HANDLERS
+    routine_mutating_types = _ROUTINE_MUTATING_ACTION_TYPES
+    read_only_types = READ_ONLY_ACTION_TYPES
+
+    for action_type, action in typed_actions:
+        if not action_type:
+            ctx.errors.append("アクション type が不正です。")
+            continue
+        handler = handlers.get(action_type)
+        if handler is None:
+            ctx.errors.append(f"未知のアクション: {action_type}")
+            continue
+        if action_type in routine_mutating_types:
+            _invalidate_routine_cache(ctx)
+        if action_type in read_only_types:
+            _run_read_only(ctx, action_type, handler, action)
+            continue
+        ctx.read_outputs.clear()
+        _run_in_savepoint(ctx, action_type, handler, action)
+
+
 def _apply_actions(
     db: Session,
     actions: List[Dict[str, Any]],
@@ -161,851 +1512,34 @@ def _apply_actions(
     guest_id: str = "default",
 ):
     # 日本語: LLM からの action 配列を順次検証・実行 / English: Validate and execute LLM-produced actions sequentially
-    results = []
-    errors = []
-    modified_ids = []
-    dirty = False
+    ctx = _ActionContext(db=db, default_date=default_date, guest_id=guest_id)
 
     if not isinstance(actions, list) or not actions:
-        return results, errors, modified_ids
+        return ctx.results, ctx.errors, ctx.modified_ids
 
+    typed_actions = _typed_actions(actions)
     try:
-        for action in actions:
-            if not isinstance(action, dict):
-                continue
-            raw_action_type = action.get("type")
-            if not isinstance(raw_action_type, str) or not raw_action_type.strip():
-                errors.append("アクション type が不正です。")
-                continue
-            action_type = raw_action_type.strip()
-            if action_type not in _ALLOWED_ACTION_TYPES:
-                errors.append(f"未知のアクション: {action_type}")
-                continue
-
-            # ---------- 原子的計算ツール ----------
-            # English: Atomic calc tools (no DB write)
-            if action_type == "calc_date_offset":
-                base_date_str = action.get("base_date")
-                base_date_val = _try_parse_iso_date(base_date_str)
-                if base_date_val is None:
-                    errors.append("calc_date_offset: base_date が不正です。YYYY-MM-DD で指定してください。")
-                    continue
-                try:
-                    offset = int(action.get("offset_days", 0))
-                except (TypeError, ValueError):
-                    errors.append("calc_date_offset: offset_days が整数ではありません。")
-                    continue
-                calc = _calc_date_offset(base_date_val, offset)
-                results.append(f"計算結果(calc_date_offset): {json.dumps(calc, ensure_ascii=False)}")
-                continue
-
-            if action_type == "calc_month_boundary":
-                try:
-                    year = int(action.get("year", 0))
-                    month = int(action.get("month", 0))
-                except (TypeError, ValueError):
-                    errors.append("calc_month_boundary: year/month が整数ではありません。")
-                    continue
-                boundary = str(action.get("boundary", "")).strip()
-                calc = _calc_month_boundary(year, month, boundary)
-                if not calc.get("ok"):
-                    errors.append(f"calc_month_boundary: {calc.get('error')}")
-                    continue
-                results.append(f"計算結果(calc_month_boundary): {json.dumps(calc, ensure_ascii=False)}")
-                continue
-
-            if action_type == "calc_nearest_weekday":
-                base_date_val = _try_parse_iso_date(action.get("base_date"))
-                if base_date_val is None:
-                    errors.append("calc_nearest_weekday: base_date が不正です。YYYY-MM-DD で指定してください。")
-                    continue
-                try:
-                    weekday = int(action.get("weekday", -1))
-                except (TypeError, ValueError):
-                    errors.append("calc_nearest_weekday: weekday が整数ではありません。")
-                    continue
-                direction = str(action.get("direction", "")).strip()
-                calc = _calc_nearest_weekday(base_date_val, weekday, direction)
-                if not calc.get("ok"):
-                    errors.append(f"calc_nearest_weekday: {calc.get('error')}")
-                    continue
-                results.append(f"計算結果(calc_nearest_weekday): {json.dumps(calc, ensure_ascii=False)}")
-                continue
-
-            if action_type == "calc_week_weekday":
-                base_date_val = _try_parse_iso_date(action.get("base_date"))
-                if base_date_val is None:
-                    errors.append("calc_week_weekday: base_date が不正です。YYYY-MM-DD で指定してください。")
-                    continue
-                try:
-                    week_offset = int(action.get("week_offset", 0))
-                    weekday = int(action.get("weekday", -1))
-                except (TypeError, ValueError):
-                    errors.append("calc_week_weekday: week_offset/weekday が整数ではありません。")
-                    continue
-                calc = _calc_week_weekday(base_date_val, week_offset, weekday)
-                if not calc.get("ok"):
-                    errors.append(f"calc_week_weekday: {calc.get('error')}")
-                    continue
-                results.append(f"計算結果(calc_week_weekday): {json.dumps(calc, ensure_ascii=False)}")
-                continue
-
-            if action_type == "calc_week_range":
-                base_date_val = _try_parse_iso_date(action.get("base_date"))
-                if base_date_val is None:
-                    errors.append("calc_week_range: base_date が不正です。YYYY-MM-DD で指定してください。")
-                    continue
-                calc = _calc_week_range(base_date_val)
-                results.append(f"計算結果(calc_week_range): {json.dumps(calc, ensure_ascii=False)}")
-                continue
-
-            if action_type == "calc_time_offset":
-                base_date_val = _try_parse_iso_date(action.get("base_date"))
-                if base_date_val is None:
-                    errors.append("calc_time_offset: base_date が不正です。YYYY-MM-DD で指定してください。")
-                    continue
-                base_time = str(action.get("base_time", "")).strip()
-                try:
-                    offset_min = int(action.get("offset_minutes", 0))
-                except (TypeError, ValueError):
-                    errors.append("calc_time_offset: offset_minutes が整数ではありません。")
-                    continue
-                calc = _calc_time_offset(base_date_val, base_time, offset_min)
-                if not calc.get("ok"):
-                    errors.append(f"calc_time_offset: {calc.get('error')}")
-                    continue
-                results.append(f"計算結果(calc_time_offset): {json.dumps(calc, ensure_ascii=False)}")
-                continue
-
-            if action_type == "get_date_info":
-                date_val = _try_parse_iso_date(action.get("date"))
-                if date_val is None:
-                    errors.append("get_date_info: date が不正です。YYYY-MM-DD で指定してください。")
-                    continue
-                calc = _get_date_info(date_val)
-                results.append(f"計算結果(get_date_info): {json.dumps(calc, ensure_ascii=False)}")
-                continue
-
-            if action_type == "create_custom_task":
-                # 日本語: 単発カスタムタスク作成 / English: Create single custom task
-                name = action.get("name")
-                if not isinstance(name, str) or not name.strip():
-                    errors.append("create_custom_task: name が指定されていません。")
-                    continue
-                raw_date_value = action.get("date")
-                if _requires_date_resolution(raw_date_value):
-                    errors.append(
-                        "create_custom_task: date に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日時へ変換してください。"
-                    )
-                    continue
-                raw_time_value = action.get("time")
-                if _requires_date_resolution(raw_time_value):
-                    errors.append(
-                        "create_custom_task: time に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日時へ変換してください。"
-                    )
-                    continue
-                date_value = _parse_date(raw_date_value, default_date)
-                time_value = raw_time_value if isinstance(raw_time_value, str) else "00:00"
-                memo = action.get("memo") if isinstance(action.get("memo"), str) else ""
-                new_task = CustomTask(
-                    guest_id=guest_id,
-                    date=date_value,
-                    name=name.strip(),
-                    time=time_value.strip(),
-                    memo=memo.strip(),
-                )
-                db.add(new_task)
-                db.flush()
-                results.append(
-                    f"カスタムタスク「{new_task.name}」(ID: {new_task.id}) を {date_value} の {new_task.time} に追加しました。"
-                )
-                modified_ids.append(f"item_custom_{new_task.id}")
-                dirty = True
-                continue
-
-            if action_type == "create_tasks_in_range":
-                # 日本語: 期間内に同一タスクを日次で一括作成 / English: Bulk-create same task for each date in range
-                name = action.get("name")
-                if not isinstance(name, str) or not name.strip():
-                    errors.append("create_tasks_in_range: name が指定されていません。")
-                    continue
-                raw_start = action.get("start_date")
-                raw_end = action.get("end_date")
-                if _requires_date_resolution(raw_start) or _requires_date_resolution(raw_end):
-                    errors.append(
-                        "create_tasks_in_range: 日付に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                start_val = _try_parse_iso_date(raw_start)
-                end_val = _try_parse_iso_date(raw_end)
-                if start_val is None or end_val is None:
-                    errors.append("create_tasks_in_range: start_date / end_date が YYYY-MM-DD 形式ではありません。")
-                    continue
-                if start_val > end_val:
-                    errors.append("create_tasks_in_range: start_date が end_date より後です。")
-                    continue
-                span = (end_val - start_val).days + 1
-                if span > 365:
-                    errors.append("create_tasks_in_range: 期間が長すぎます（最大365日）。")
-                    continue
-                raw_time_value = action.get("time")
-                time_value = raw_time_value if isinstance(raw_time_value, str) and raw_time_value.strip() else "00:00"
-                memo = action.get("memo") if isinstance(action.get("memo"), str) else ""
-                added_dates = []
-                cur = start_val
-                while cur <= end_val:
-                    new_task = CustomTask(
-                        guest_id=guest_id,
-                        date=cur,
-                        name=name.strip(),
-                        time=time_value.strip(),
-                        memo=memo.strip(),
-                    )
-                    db.add(new_task)
-                    added_dates.append(cur.isoformat())
-                    cur += datetime.timedelta(days=1)
-                db.flush()
-                results.append(
-                    f"「{name.strip()}」を {start_val.isoformat()} から {end_val.isoformat()} まで {span} 件登録しました。"
-                )
-                modified_ids.extend([f"item_custom_{d}" for d in added_dates])
-                dirty = True
-                continue
-
-            if action_type == "delete_custom_task":
-                # 日本語: ID指定でカスタムタスク削除 / English: Delete custom task by ID
-                task_id = action.get("task_id")
-                try:
-                    task_id_int = int(task_id)
-                except (TypeError, ValueError):
-                    errors.append("delete_custom_task: task_id が不正です。")
-                    continue
-                task_obj = db.get(CustomTask, task_id_int)
-                if task_obj and task_obj.guest_id != guest_id:
-                    task_obj = None
-                if not task_obj:
-                    errors.append(f"task_id={task_id_int} が見つかりませんでした。")
-                    continue
-                db.delete(task_obj)
-                results.append(f"カスタムタスク「{task_obj.name}」を削除しました。")
-                dirty = True
-                continue
-
-            if action_type == "delete_tasks_in_range":
-                # 日本語: 期間内カスタムタスクを一括削除 / English: Delete all custom tasks within date range
-                raw_start = action.get("start_date")
-                raw_end = action.get("end_date")
-                if _requires_date_resolution(raw_start) or _requires_date_resolution(raw_end):
-                    errors.append(
-                        "delete_tasks_in_range: 日付に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                start_val = _try_parse_iso_date(raw_start)
-                end_val = _try_parse_iso_date(raw_end)
-                if start_val is None or end_val is None:
-                    errors.append("delete_tasks_in_range: start_date / end_date が YYYY-MM-DD 形式ではありません。")
-                    continue
-                if start_val > end_val:
-                    errors.append("delete_tasks_in_range: start_date が end_date より後です。")
-                    continue
-                tasks_to_delete = db.exec(
-                    select(CustomTask)
-                    .where(CustomTask.date.between(start_val, end_val), CustomTask.guest_id == guest_id)
-                ).all()
-                count = len(tasks_to_delete)
-                for t in tasks_to_delete:
-                    db.delete(t)
-                if count > 0:
-                    results.append(
-                        f"{start_val.isoformat()} から {end_val.isoformat()} までのカスタムタスク {count} 件を削除しました。"
-                    )
-                    modified_ids.append("task-list")
-                    dirty = True
-                else:
-                    results.append(
-                        f"{start_val.isoformat()} から {end_val.isoformat()} までに削除対象のタスクはありませんでした。"
-                    )
-                continue
-
-            if action_type == "toggle_step":
-                # 日本語: ルーチンステップの完了/メモ更新 / English: Update completion/memo for routine step
-                step_id = action.get("step_id")
-                try:
-                    step_id_int = int(step_id)
-                except (TypeError, ValueError):
-                    errors.append("toggle_step: step_id が不正です。")
-                    continue
-                step_obj = db.get(Step, step_id_int)
-                if step_obj and step_obj.guest_id != guest_id:
-                    step_obj = None
-                if not step_obj:
-                    errors.append(f"step_id={step_id_int} が見つかりませんでした。")
-                    continue
-                raw_date_value = action.get("date")
-                if _requires_date_resolution(raw_date_value):
-                    errors.append(
-                        "toggle_step: date に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                date_value = _parse_date(raw_date_value, default_date)
-                log = db.exec(
-                    select(DailyLog).where(
-                        DailyLog.date == date_value, DailyLog.step_id == step_obj.id, DailyLog.guest_id == guest_id
-                    )
-                ).first()
-                if not log:
-                    log = DailyLog(guest_id=guest_id, date=date_value, step_id=step_obj.id)
-                    db.add(log)
-                log.done = _bool_from_value(action.get("done"), True)
-                memo = action.get("memo")
-                if isinstance(memo, str):
-                    log.memo = memo.strip()
-                results.append(
-                    f"ステップ「{step_obj.name}」({date_value}) を {'完了' if log.done else '未完了'} に更新しました。"
-                )
-                modified_ids.append(f"item_routine_{step_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "toggle_custom_task":
-                # 日本語: カスタムタスクの完了/メモ更新 / English: Update completion/memo for custom task
-                task_id = action.get("task_id")
-                try:
-                    task_id_int = int(task_id)
-                except (TypeError, ValueError):
-                    errors.append("toggle_custom_task: task_id が不正です。")
-                    continue
-                task_obj = db.get(CustomTask, task_id_int)
-                if task_obj and task_obj.guest_id != guest_id:
-                    task_obj = None
-                if not task_obj:
-                    errors.append(f"task_id={task_id_int} が見つかりませんでした。")
-                    continue
-                task_obj.done = _bool_from_value(action.get("done"), True)
-                memo = action.get("memo")
-                if isinstance(memo, str):
-                    task_obj.memo = memo.strip()
-                results.append(
-                    f"カスタムタスク「{task_obj.name}」を {'完了' if task_obj.done else '未完了'} に更新しました。"
-                )
-                modified_ids.append(f"item_custom_{task_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "update_custom_task_time":
-                # 日本語: カスタムタスク時刻変更 / English: Update custom task time
-                task_id = action.get("task_id")
-                new_time = action.get("new_time")
-                if not new_time:
-                    errors.append("update_custom_task_time: new_time が指定されていません。")
-                    continue
-                try:
-                    task_id_int = int(task_id)
-                except (TypeError, ValueError):
-                    errors.append("update_custom_task_time: task_id が不正です。")
-                    continue
-                task_obj = db.get(CustomTask, task_id_int)
-                if task_obj and task_obj.guest_id != guest_id:
-                    task_obj = None
-                if not task_obj:
-                    errors.append(f"task_id={task_id_int} が見つかりませんでした。")
-                    continue
-                task_obj.time = str(new_time).strip()
-                results.append(f"カスタムタスク「{task_obj.name}」の時刻を {task_obj.time} に更新しました。")
-                modified_ids.append(f"item_custom_{task_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "rename_custom_task":
-                # 日本語: カスタムタスク名変更 / English: Rename custom task
-                task_id = action.get("task_id")
-                new_name = action.get("new_name")
-                if not new_name:
-                    errors.append("rename_custom_task: new_name が指定されていません。")
-                    continue
-                try:
-                    task_id_int = int(task_id)
-                except (TypeError, ValueError):
-                    errors.append("rename_custom_task: task_id が不正です。")
-                    continue
-                task_obj = db.get(CustomTask, task_id_int)
-                if task_obj and task_obj.guest_id != guest_id:
-                    task_obj = None
-                if not task_obj:
-                    errors.append(f"task_id={task_id_int} が見つかりませんでした。")
-                    continue
-                old_name = task_obj.name
-                task_obj.name = str(new_name).strip()
-                results.append(f"カスタムタスク「{old_name}」の名前を「{task_obj.name}」に更新しました。")
-                modified_ids.append(f"item_custom_{task_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "update_custom_task_memo":
-                # 日本語: カスタムタスクメモ更新 / English: Update custom task memo
-                task_id = action.get("task_id")
-                new_memo = action.get("new_memo")
-                if new_memo is None:
-                    errors.append("update_custom_task_memo: new_memo が指定されていません。")
-                    continue
-                try:
-                    task_id_int = int(task_id)
-                except (TypeError, ValueError):
-                    errors.append("update_custom_task_memo: task_id が不正です。")
-                    continue
-                task_obj = db.get(CustomTask, task_id_int)
-                if task_obj and task_obj.guest_id != guest_id:
-                    task_obj = None
-                if not task_obj:
-                    errors.append(f"task_id={task_id_int} が見つかりませんでした。")
-                    continue
-                task_obj.memo = str(new_memo).strip()
-                results.append(f"カスタムタスク「{task_obj.name}」のメモを更新しました。")
-                modified_ids.append(f"item_custom_{task_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "update_log":
-                # 日本語: 日報を上書き保存 / English: Overwrite day log content
-                content = action.get("content")
-                if not isinstance(content, str) or not content.strip():
-                    errors.append("update_log: content が指定されていません。")
-                    continue
-                raw_date_value = action.get("date")
-                if _requires_date_resolution(raw_date_value):
-                    errors.append(
-                        "update_log: date に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                date_value = _parse_date(raw_date_value, default_date)
-                day_log = db.exec(
-                    select(DayLog).where(DayLog.date == date_value, DayLog.guest_id == guest_id)
-                ).first()
-                if not day_log:
-                    day_log = DayLog(guest_id=guest_id, date=date_value)
-                    db.add(day_log)
-                day_log.content = content.strip()
-                results.append(f"{date_value} の日報を更新しました。")
-                modified_ids.append("daily-log-card")
-                dirty = True
-                continue
-
-            if action_type == "append_day_log":
-                # 日本語: 既存日報へ追記 / English: Append text to existing day log
-                content = action.get("content")
-                if not isinstance(content, str) or not content.strip():
-                    errors.append("append_day_log: content が指定されていません。")
-                    continue
-                raw_date_value = action.get("date")
-                if _requires_date_resolution(raw_date_value):
-                    errors.append(
-                        "append_day_log: date に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                date_value = _parse_date(raw_date_value, default_date)
-                day_log = db.exec(
-                    select(DayLog).where(DayLog.date == date_value, DayLog.guest_id == guest_id)
-                ).first()
-                if not day_log:
-                    day_log = DayLog(guest_id=guest_id, date=date_value)
-                    day_log.content = content.strip()
-                    db.add(day_log)
-                else:
-                    current_content = day_log.content or ""
-                    if current_content:
-                        day_log.content = current_content + "\n" + content.strip()
-                    else:
-                        day_log.content = content.strip()
-
-                results.append(f"{date_value} の日報に追記しました。")
-                modified_ids.append("daily-log-card")
-                dirty = True
-                continue
-
-            if action_type == "get_day_log":
-                # 日本語: 日報参照（読み取り専用） / English: Fetch day log (read-only)
-                raw_date_value = action.get("date")
-                if _requires_date_resolution(raw_date_value):
-                    errors.append(
-                        "get_day_log: date に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                date_value = _parse_date(raw_date_value, default_date)
-                day_log = db.exec(
-                    select(DayLog).where(DayLog.date == date_value, DayLog.guest_id == guest_id)
-                ).first()
-                if day_log and day_log.content:
-                    results.append(f"{date_value} の日報:\n{day_log.content}")
-                else:
-                    results.append(f"{date_value} の日報は見つかりませんでした。")
-                continue
-
-            if action_type == "add_routine":
-                # 日本語: ルーチン追加 / English: Create routine
-                name = action.get("name")
-                if not name:
-                    errors.append("add_routine: name is required")
-                    continue
-                days = action.get("days", "0,1,2,3,4")
-                desc = action.get("description", "")
-                routine = Routine(guest_id=guest_id, name=name, days=days, description=desc)
-                db.add(routine)
-                db.flush()
-                results.append(f"ルーチン「{name}」(ID: {routine.id}) を追加しました。")
-                dirty = True
-                continue
-
-            if action_type == "delete_routine":
-                # 日本語: ID/名称/全件指定に対応したルーチン削除 / English: Delete routine by ID, name, or delete-all intent
-                rid = action.get("routine_id")
-                routine_name = action.get("routine_name")
-                delete_all = _is_delete_all_routine_request(action, routine_name)
-
-                if rid is not None and str(rid).strip() != "":
-                    # 日本語: routine_id があれば最優先で削除 / English: Prioritize explicit routine_id when provided
-                    try:
-                        routine_id_int = int(rid)
-                    except (TypeError, ValueError):
-                        errors.append("delete_routine: routine_id が不正です。")
-                        continue
-                    routine_obj = db.get(Routine, routine_id_int)
-                    if routine_obj and routine_obj.guest_id != guest_id:
-                        routine_obj = None
-                    if not routine_obj:
-                        errors.append(f"routine_id={routine_id_int} が見つかりませんでした。")
-                        continue
-                    db.delete(routine_obj)
-                    results.append(f"ルーチン「{routine_obj.name}」を削除しました。")
-                    dirty = True
-                    continue
-
-                routines = db.exec(select(Routine).where(Routine.guest_id == guest_id)).all()
-
-                if delete_all:
-                    # 日本語: 全件削除モード / English: Delete-all mode
-                    if not routines:
-                        results.append("削除対象のルーチンはありませんでした。")
-                        continue
-                    deleted_count = 0
-                    for routine_obj in routines:
-                        db.delete(routine_obj)
-                        deleted_count += 1
-                    results.append(f"ルーチンを{deleted_count}件削除しました。")
-                    dirty = True
-                    continue
-
-                if not isinstance(routine_name, str) or not routine_name.strip():
-                    errors.append(
-                        "delete_routine: routine_id / routine_name / scope=all のいずれかを指定してください。"
-                    )
-                    continue
-
-                matched_routines, match_mode = _match_routines_by_name(routines, routine_name)
-                if not matched_routines:
-                    errors.append(
-                        f"delete_routine: routine_name='{routine_name.strip()}' に一致するルーチンが見つかりませんでした。"
-                    )
-                    continue
-
-                if match_mode != "exact" and len(matched_routines) > 1:
-                    # 日本語: 部分一致が複数ある場合は誤削除防止で停止 / English: Stop on ambiguous partial matches to avoid accidental deletions
-                    candidates = "、".join(
-                        f"{item.name}(ID:{item.id})" for item in matched_routines[:5]
-                    )
-                    errors.append(
-                        "delete_routine: routine_name に一致するルーチンが複数あります。"
-                        f" 候補: {candidates}。routine_id またはより具体的な routine_name を指定してください。"
-                    )
-                    continue
-
-                for routine_obj in matched_routines:
-                    db.delete(routine_obj)
-                deleted_count = len(matched_routines)
-                if deleted_count == 1:
-                    results.append(f"ルーチン「{matched_routines[0].name}」を削除しました。")
-                else:
-                    results.append(
-                        f"ルーチン名「{routine_name.strip()}」に一致した {deleted_count} 件を削除しました。"
-                    )
-                dirty = True
-                continue
-
-            if action_type == "update_routine_days":
-                # 日本語: ルーチンの有効曜日更新 / English: Update routine active weekdays
-                routine_id = action.get("routine_id")
-                new_days = action.get("new_days")
-                if not new_days:
-                    errors.append("update_routine_days: new_days が指定されていません。")
-                    continue
-                try:
-                    routine_id_int = int(routine_id)
-                except (TypeError, ValueError):
-                    errors.append("update_routine_days: routine_id が不正です。")
-                    continue
-                routine_obj = db.get(Routine, routine_id_int)
-                if routine_obj and routine_obj.guest_id != guest_id:
-                    routine_obj = None
-                if not routine_obj:
-                    errors.append(f"routine_id={routine_id_int} が見つかりませんでした。")
-                    continue
-                routine_obj.days = str(new_days).strip()
-                results.append(f"ルーチン「{routine_obj.name}」の曜日を {routine_obj.days} に更新しました。")
-                dirty = True
-                continue
-
-            if action_type == "add_step":
-                # 日本語: ルーチンへステップ追加 / English: Add new step to routine
-                rid = action.get("routine_id")
-                name = action.get("name")
-                if not rid or not name:
-                    errors.append("add_step: routine_id and name required")
-                    continue
-                try:
-                    routine_id_int = int(rid)
-                except (TypeError, ValueError):
-                    errors.append("add_step: routine_id が不正です。")
-                    continue
-                routine_obj = db.get(Routine, routine_id_int)
-                if not routine_obj or routine_obj.guest_id != guest_id:
-                    errors.append(f"routine_id={routine_id_int} が見つかりませんでした。")
-                    continue
-                step = Step(
-                    guest_id=guest_id,
-                    routine_id=routine_obj.id,
-                    name=name,
-                    time=action.get("time", "00:00"),
-                    category=action.get("category", "Other"),
-                )
-                db.add(step)
-                db.flush()
-                results.append(f"ルーチン(ID:{rid})にステップ「{name}」(ID: {step.id}) を追加しました。")
-                modified_ids.append(f"item_routine_{step.id}")
-                dirty = True
-                continue
-
-            if action_type == "delete_step":
-                # 日本語: ステップ削除 / English: Delete step by ID
-                sid = action.get("step_id")
-                step = db.get(Step, int(sid)) if sid else None
-                if step and step.guest_id != guest_id:
-                    step = None
-                if step:
-                    db.delete(step)
-                    results.append(f"ステップ「{step.name}」を削除しました。")
-                    dirty = True
-                else:
-                    errors.append("delete_step: not found")
-                continue
-
-            if action_type == "update_step_time":
-                # 日本語: ステップ時刻更新 / English: Update step time
-                step_id = action.get("step_id")
-                new_time = action.get("new_time")
-                if not new_time:
-                    errors.append("update_step_time: new_time が指定されていません。")
-                    continue
-                try:
-                    step_id_int = int(step_id)
-                except (TypeError, ValueError):
-                    errors.append("update_step_time: step_id が不正です。")
-                    continue
-                step_obj = db.get(Step, step_id_int)
-                if step_obj and step_obj.guest_id != guest_id:
-                    step_obj = None
-                if not step_obj:
-                    errors.append(f"step_id={step_id_int} が見つかりませんでした。")
-                    continue
-                step_obj.time = str(new_time).strip()
-                results.append(f"ステップ「{step_obj.name}」の時刻を {step_obj.time} に更新しました。")
-                modified_ids.append(f"item_routine_{step_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "rename_step":
-                # 日本語: ステップ名変更 / English: Rename step
-                step_id = action.get("step_id")
-                new_name = action.get("new_name")
-                if not new_name:
-                    errors.append("rename_step: new_name が指定されていません。")
-                    continue
-                try:
-                    step_id_int = int(step_id)
-                except (TypeError, ValueError):
-                    errors.append("rename_step: step_id が不正です。")
-                    continue
-                step_obj = db.get(Step, step_id_int)
-                if step_obj and step_obj.guest_id != guest_id:
-                    step_obj = None
-                if not step_obj:
-                    errors.append(f"step_id={step_id_int} が見つかりませんでした。")
-                    continue
-                old_name = step_obj.name
-                step_obj.name = str(new_name).strip()
-                results.append(f"ステップ「{old_name}」の名前を「{step_obj.name}」に更新しました。")
-                modified_ids.append(f"item_routine_{step_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "update_step_memo":
-                # 日本語: ステップメモ更新 / English: Update step memo
-                step_id = action.get("step_id")
-                new_memo = action.get("new_memo")
-                if new_memo is None:
-                    errors.append("update_step_memo: new_memo が指定されていません。")
-                    continue
-                try:
-                    step_id_int = int(step_id)
-                except (TypeError, ValueError):
-                    errors.append("update_step_memo: step_id が不正です。")
-                    continue
-                step_obj = db.get(Step, step_id_int)
-                if step_obj and step_obj.guest_id != guest_id:
-                    step_obj = None
-                if not step_obj:
-                    errors.append(f"step_id={step_id_int} が見つかりませんでした。")
-                    continue
-                step_obj.memo = str(new_memo).strip()
-                results.append(f"ステップ「{step_obj.name}」のメモを更新しました。")
-                modified_ids.append(f"item_routine_{step_obj.id}")
-                dirty = True
-                continue
-
-            if action_type == "list_tasks_in_period":
-                # 日本語: 期間内のカスタムタスク+ルーチンを横断取得 / English: List both custom tasks and routine steps in date range
-                raw_start_date = action.get("start_date")
-                raw_end_date = action.get("end_date")
-                if _requires_date_resolution(raw_start_date) or _requires_date_resolution(raw_end_date):
-                    errors.append(
-                        "list_tasks_in_period: 相対日付が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                start_date = _parse_date(raw_start_date, default_date)
-                end_date = _parse_date(raw_end_date, default_date)
-
-                if start_date > end_date:
-                    errors.append("list_tasks_in_period: 開始日が終了日より後です。")
-                    continue
-
-                tasks_info = []
-
-                custom_tasks = db.exec(
-                    select(CustomTask)
-                    .where(CustomTask.date.between(start_date, end_date), CustomTask.guest_id == guest_id)
-                    .order_by(CustomTask.date, CustomTask.time)
-                ).all()
-                for custom_task in custom_tasks:
-                    tasks_info.append(
-                        f"カスタムタスク [{custom_task.id}]: {custom_task.date.isoformat()} {custom_task.time} - {custom_task.name} (完了: {custom_task.done}) (メモ: {custom_task.memo if custom_task.memo else 'なし'})"
-                    )
-
-                current_date = start_date
-                while current_date <= end_date:
-                    # 日本語: 日ごとに該当曜日ルーチンを展開 / English: Expand weekday routines date-by-date
-                    routines_for_day = get_weekday_routines(db, current_date.weekday(), guest_id=guest_id)
-                    for routine in routines_for_day:
-                        for step in routine.steps:
-                            log = db.exec(
-                                select(DailyLog).where(
-                                    DailyLog.date == current_date,
-                                    DailyLog.step_id == step.id,
-                                    DailyLog.guest_id == guest_id,
-                                )
-                            ).first()
-                            status = "完了" if log and log.done else "未完了"
-                            memo = log.memo if log and log.memo else (step.memo if step.memo else "なし")
-                            tasks_info.append(
-                                f"ルーチンステップ [{step.id}]: {current_date.isoformat()} {step.time} - {routine.name} - {step.name} (完了: {status}) (メモ: {memo})"
-                            )
-                    current_date += datetime.timedelta(days=1)
-
-                if tasks_info:
-                    results.append(
-                        f"{start_date.isoformat()} から {end_date.isoformat()} までのタスク:\n"
-                        + "\n".join(tasks_info)
-                    )
-                else:
-                    results.append(
-                        f"{start_date.isoformat()} から {end_date.isoformat()} までのタスクは見つかりませんでした。"
-                    )
-                continue
-
-            if action_type == "get_daily_summary":
-                # 日本語: 指定日の活動要約を組み立て / English: Build daily activity summary
-                raw_date_value = action.get("date")
-                if _requires_date_resolution(raw_date_value):
-                    errors.append(
-                        "get_daily_summary: date に相対表現が含まれています。"
-                        " 計算ツール(calc_*)で先に絶対日付へ変換してください。"
-                    )
-                    continue
-                target_date = _parse_date(raw_date_value, default_date)
-
-                summary_parts = []
-
-                day_log = db.exec(
-                    select(DayLog).where(DayLog.date == target_date, DayLog.guest_id == guest_id)
-                ).first()
-                if day_log and day_log.content:
-                    summary_parts.append(f"日報: {day_log.content}")
-                else:
-                    summary_parts.append("日報: なし")
-
-                custom_tasks = db.exec(
-                    select(CustomTask).where(CustomTask.date == target_date, CustomTask.guest_id == guest_id)
-                ).all()
-                if custom_tasks:
-                    summary_parts.append("カスタムタスク:")
-                    for custom_task in custom_tasks:
-                        status = "完了" if custom_task.done else "未完了"
-                        summary_parts.append(
-                            f"- {custom_task.time} {custom_task.name} ({status}) (メモ: {custom_task.memo if custom_task.memo else 'なし'})"
-                        )
-                else:
-                    summary_parts.append("カスタムタスク: なし")
-
-                routines_for_day = get_weekday_routines(db, target_date.weekday(), guest_id=guest_id)
-                if routines_for_day:
-                    summary_parts.append("ルーチンステップ:")
-                    for routine in routines_for_day:
-                        for step in routine.steps:
-                            log = db.exec(
-                                select(DailyLog).where(
-                                    DailyLog.date == target_date,
-                                    DailyLog.step_id == step.id,
-                                    DailyLog.guest_id == guest_id,
-                                )
-                            ).first()
-                            status = "完了" if log and log.done else "未完了"
-                            memo = log.memo if log and log.memo else (step.memo if step.memo else "なし")
-                            summary_parts.append(
-                                f"- {step.time} {routine.name} - {step.name} ({status}) (メモ: {memo})"
-                            )
-                else:
-                    summary_parts.append("ルーチンステップ: なし")
-
-                results.append(f"{target_date.isoformat()} の活動概要:\n" + "\n".join(summary_parts))
-                continue
-
-            errors.append(f"未知のアクション: {action_type}")
-        if dirty:
-            # 日本語: 変更があった場合のみコミット / English: Commit only when at least one mutating action succeeded
-            db.commit()
+        if _is_read_only_batch(typed_actions):
+            # 日本語: 参照のみのバッチは autoflush・先読み・コミットを省略 / English: Read-only batches skip autoflush, prefetching and the commit
+            # 日本語: Session とバッチ内キャッシュを共有するため並列化せず順次実行する / English: Run serially: actions share one Session (not thread-safe) and the batch caches
+            with db.no_autoflush:
+                _prefetch_day_logs(ctx, typed_actions)
+                _dispatch_actions(ctx, typed_actions)
+        else:
+            _prefetch_referenced_rows(ctx, typed_actions)
+            _prefetch_day_logs(ctx, typed_actions)
+            _dispatch_actions(ctx, typed_actions)
+            if ctx.dirty:
+                # 日本語: 変更があった場合のみコミット / English: Commit only when at least one mutating action succeeded
+                db.commit()
     except Exception as exc:  # noqa: BLE001
         # 日本語: 途中失敗時は全ロールバックしてエラー返却 / English: Roll back whole batch on unexpected failure
         db.rollback()
-        errors.append(f"操作の適用に失敗しました: {exc}")
-        results = []
+        ctx.errors.append(f"操作の適用に失敗しました: {exc}")
+        ctx.results = []
 
-    return results, errors, modified_ids
+    # 日本語: 同じ要素を複数回更新しても UI へ返す ID は1回にする(順序は維持) / English: Report each touched element once even if several actions hit it, keeping first-seen order
+    return ctx.results, ctx.errors, list(dict.fromkeys(ctx.modified_ids))
 
 
 __all__ = ["READ_ONLY_ACTION_TYPES", "_CALC_ACTION_TYPES", "_apply_actions"]
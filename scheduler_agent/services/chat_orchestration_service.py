@@ -23,7 +23,14 @@ from scheduler_agent.services.reply_service import (
     _build_final_reply,
 )
 from scheduler_agent.services.schedule_parser_service import (
+    _calc_date_offset,
+    _calc_month_boundary,
+    _calc_nearest_weekday,
+    _calc_time_offset,
+    _calc_week_range,
+    _calc_week_weekday,
     _extract_relative_week_shift,
+    _get_date_info,
     _extract_weekday,
     _requires_date_resolution,
     _try_parse_iso_date,
@@ -271,92 +278,103 @@ def _format_step_progress(steps: List[Dict[str, Any]], completed_steps: int) ->
     return "\n".join(lines)
 
 
+# 日本語: calc_* 1件を (計算結果, 表示用式) に変換。基準日が不正なら None / English: Turn one calc_* action into (result, expression label); None when its base date is invalid
+_CalcMemoryHandler = Callable[[Dict[str, Any]], "tuple[Dict[str, Any], str] | None"]
+
+
+def _memory_calc_date_offset(action: Dict[str, Any]) -> tuple[Dict[str, Any], str] | None:
+    bd = _try_parse_iso_date(action.get("base_date"))
+    if bd is None:
+        return None
+    offset = int(action.get("offset_days", 0))
+    return _calc_date_offset(bd, offset), f"calc_date_offset({bd.isoformat()}, {offset})"
+
+
+def _memory_calc_month_boundary(action: Dict[str, Any]) -> tuple[Dict[str, Any], str] | None:
+    year = int(action.get("year", 0))
+    month = int(action.get("month", 0))
+    boundary = str(action.get("boundary", ""))
+    return _calc_month_boundary(year, month, boundary), f"calc_month_boundary({year}, {month}, {boundary})"
+
+
+def _memory_calc_nearest_weekday(action: Dict[str, Any]) -> tuple[Dict[str, Any], str] | None:
+    bd = _try_parse_iso_date(action.get("base_date"))
+    if bd is None:
+        return None
+    wd = int(action.get("weekday", -1))
+    direction = str(action.get("direction", ""))
+    return (
+        _calc_nearest_weekday(bd, wd, direction),
+        f"calc_nearest_weekday({bd.isoformat()}, {wd}, {direction})",
+    )
+
+
+def _memory_calc_week_weekday(action: Dict[str, Any]) -> tuple[Dict[str, Any], str] | None:
+    bd = _try_parse_iso_date(action.get("base_date"))
+    if bd is None:
+        return None
+    wo = int(action.get("week_offset", 0))
+    wd = int(action.get("weekday", -1))
+    return _calc_week_weekday(bd, wo, wd), f"calc_week_weekday({bd.isoformat()}, {wo}, {wd})"
+
+
+def _memory_calc_week_range(action: Dict[str, Any]) -> tuple[Dict[str, Any], str] | None:
+    bd = _try_parse_iso_date(action.get("base_date"))
+    if bd is None:
+        return None
+    return _calc_week_range(bd), f"calc_week_range({bd.isoformat()})"
+
+
+def _memory_calc_time_offset(action: Dict[str, Any]) -> tuple[Dict[str, Any], str] | None:
+    bd = _try_parse_iso_date(action.get("base_date"))
+    if bd is None:
+        return None
+    bt = str(action.get("base_time", ""))
+    om = int(action.get("offset_minutes", 0))
+    return _calc_time_offset(bd, bt, om), f"calc_time_offset({bd.isoformat()}, {bt}, {om})"
+
+
+def _memory_get_date_info(action: Dict[str, Any]) -> tuple[Dict[str, Any], str] | None:
+    d = _try_parse_iso_date(action.get("date"))
+    if d is None:
+        return None
+    return _get_date_info(d), f"get_date_info({d.isoformat()})"
+
+
+# 日本語: calc action type → メモリ抽出関数 / English: Dispatch table mapping calc action type to its memory extractor
+_CALC_MEMORY_HANDLERS: Dict[str, _CalcMemoryHandler] = {
+    "calc_date_offset": _memory_calc_date_offset,
+    "calc_month_boundary": _memory_calc_month_boundary,
+    "calc_nearest_weekday": _memory_calc_nearest_weekday,
+    "calc_week_weekday": _memory_calc_week_weekday,
+    "calc_week_range": _memory_calc_week_range,
+    "calc_time_offset": _memory_calc_time_offset,
+    "get_date_info": _memory_get_date_info,
+}
+
+
 def _extract_resolved_memory_from_actions(
     actions: List[Dict[str, Any]],
     default_date: datetime.date,
 ) -> List[Dict[str, str]]:
     # 日本語: calc_* 実行結果を次ラウンド再利用用メモリへ抽出 / English: Extract calc-tool results for reuse in subsequent rounds
     """Extract calculation results from atomic calc tool actions for memory."""
-    from scheduler_agent.services.schedule_parser_service import (
-        _calc_date_offset,
-        _calc_month_boundary,
-        _calc_nearest_weekday,
-        _calc_time_offset,
-        _calc_week_range,
-        _calc_week_weekday,
-        _get_date_info,
-    )
-
     memories: List[Dict[str, str]] = []
     for action in actions:
         if not isinstance(action, dict):
             continue
         action_type = action.get("type")
-        if action_type not in _CALC_ACTION_TYPES:
+        handler = _CALC_MEMORY_HANDLERS.get(action_type) if isinstance(action_type, str) else None
+        if handler is None:
             continue
 
-        calc: Dict[str, Any] = {}
-        description = action_type
-
         try:
-            if action_type == "calc_date_offset":
-                bd = _try_parse_iso_date(action.get("base_date"))
-                if bd is None:
-                    continue
-                offset = int(action.get("offset_days", 0))
-                calc = _calc_date_offset(bd, offset)
-                description = f"calc_date_offset({bd.isoformat()}, {offset})"
-
-            elif action_type == "calc_month_boundary":
-                year = int(action.get("year", 0))
-                month = int(action.get("month", 0))
-                boundary = str(action.get("boundary", ""))
-                calc = _calc_month_boundary(year, month, boundary)
-                description = f"calc_month_boundary({year}, {month}, {boundary})"
-
-            elif action_type == "calc_nearest_weekday":
-                bd = _try_parse_iso_date(action.get("base_date"))
-                if bd is None:
-                    continue
-                wd = int(action.get("weekday", -1))
-                direction = str(action.get("direction", ""))
-                calc = _calc_nearest_weekday(bd, wd, direction)
-                description = f"calc_nearest_weekday({bd.isoformat()}, {wd}, {direction})"
-
-            elif action_type == "calc_week_weekday":
-                bd = _try_parse_iso_date(action.get("base_date"))
-                if bd is None:
-                    continue
-                wo = int(action.get("week_offset", 0))
-                wd = int(action.get("weekday", -1))
-                calc = _calc_week_weekday(bd, wo, wd)
-                description = f"calc_week_weekday({bd.isoformat()}, {wo}, {wd})"
-
-            elif action_type == "calc_week_range":
-                bd = _try_parse_iso_date(action.get("base_date"))
-                if bd is None:
-                    continue
-                calc = _calc_week_range(bd)
-                description = f"calc_week_range({bd.isoformat()})"
-
-            elif action_type == "calc_time_offset":
-                bd = _try_parse_iso_date(action.get("base_date"))
-                if bd is None:
-                    continue
-                bt = str(action.get("base_time", ""))
-                om = int(action.get("offset_minutes", 0))
-                calc = _calc_time_offset(bd, bt, om)
-                description = f"calc_time_offset({bd.isoformat()}, {bt}, {om})"
-
-            elif action_type == "get_date_info":
-                d = _try_parse_iso_date(action.get("date"))
-                if d is None:
-                    continue
-                calc = _get_date_info(d)
-                description = f"get_date_info({d.isoformat()})"
-
+            extracted = handler(action)
         except (TypeError, ValueError):
             continue
+        if extracted is None:
+            continue
+        calc, description = extracted
 
         if not calc.get("ok"):
             continue
@@ -509,24 +527,24 @@ def _run_scheduler_multi_step(
         # receives the calculated result before specifying dates for other tools.
         # 日本語: calc_* と日付依存操作が混在したら前者を先行実行 / English: Prioritize calc_* actions when mixed with date-dependent writes
         deferred_actions: List[Dict[str, Any]] = []
-        has_calc = any(
-            str(a.get("type", "")) in _CALC_ACTION_TYPES for a in current_actions
-        )
+        # 日本語: type は1アクションにつき1回だけ取り出して各判定で使い回す / English: Read each action's type once and reuse it for every check below
+        current_action_types = [str(a.get("type", "")) for a in current_actions]
+        has_calc = any(action_type in _CALC_ACTION_TYPES for action_type in current_action_types)
         has_date_dependent = any(
-            str(a.get("type", "")) in _DATE_DEPENDENT_ACTION_TYPES for a in current_actions
+            action_type in _DATE_DEPENDENT_ACTION_TYPES for action_type in current_action_types
         )
         if has_calc and has_date_dependent:
             kept: List[Dict[str, Any]] = []
-            for a in current_actions:
-                if str(a.get("type", "")) in _DATE_DEPENDENT_ACTION_TYPES:
+            kept_types: List[str] = []
+            for a, action_type in zip(current_actions, current_action_types):
+                if action_type in _DATE_DEPENDENT_ACTION_TYPES:
                     deferred_actions.append(a)
                 else:
                     kept.append(a)
+                    kept_types.append(action_type)
             current_actions = kept
+            current_action_types = kept_types
 
-        current_action_types = [
-            str(action.get("type", "")) for action in current_actions if isinstance(action, dict)
-        ]
         all_read_only = bool(current_action_types) and all(
             action_type in READ_ONLY_ACTION_TYPES for action_type in current_action_types
         )
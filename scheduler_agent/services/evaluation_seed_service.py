@@ -52,8 +52,13 @@ def _seed_evaluation_data(
             db.add(step)
         messages.append(f"Seeded Routine '{routine_name}'")
 
-    current_date = start_date
-    while current_date <= end_date:
+    # 日本語: 日付列は range で一括生成し、ループ内で timedelta を作り直さない / English: Build the dates from one range instead of re-creating a timedelta per iteration
+    seed_dates = [start_date + datetime.timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    # 日本語: ステップ一覧は全日共通なのでループ前に1回だけ取得 / English: The routine's steps are the same every day, so load them once before the loop
+    all_steps = db.exec(
+        select(Step).where(Step.routine_id == daily_routine.id, Step.guest_id == guest_id)
+    ).all()
+    for current_date in seed_dates:
         # 日本語: 対象日の既存データを初期化してから投入 / English: Clear existing rows before seeding target date data
         db.exec(delete(DailyLog).where(DailyLog.date == current_date, DailyLog.guest_id == guest_id))
         db.exec(delete(CustomTask).where(CustomTask.date == current_date, CustomTask.guest_id == guest_id))
@@ -84,38 +89,31 @@ def _seed_evaluation_data(
         )
         messages.append(f"Seeded Custom Tasks for {current_date.isoformat()}")
 
-        if daily_routine:
-            # 日本語: 一部ステップのみ完了済みデータを作り、評価の差分を作る / English: Mark subset of steps done to create realistic mixed completion state
-            all_steps = db.exec(
-                select(Step).where(Step.routine_id == daily_routine.id, Step.guest_id == guest_id)
-            ).all()
-            if all_steps:
-                if len(all_steps) >= 1:
-                    log_entry = DailyLog(
-                        guest_id=guest_id,
-                        date=current_date,
-                        step_id=all_steps[0].id,
-                        done=True,
-                        memo="朝の活動完了",
-                    )
-                    db.add(log_entry)
-                    messages.append(
-                        f"Marked step '{all_steps[0].name}' as done for {current_date.isoformat()}"
-                    )
-                if len(all_steps) >= 3:
-                    log_entry = DailyLog(
-                        guest_id=guest_id,
-                        date=current_date,
-                        step_id=all_steps[2].id,
-                        done=True,
-                        memo="メールチェック完了",
-                    )
-                    db.add(log_entry)
-                    messages.append(
-                        f"Marked step '{all_steps[2].name}' as done for {current_date.isoformat()}"
-                    )
-
-        current_date += datetime.timedelta(days=1)
+        # 日本語: 一部ステップのみ完了済みデータを作り、評価の差分を作る / English: Mark subset of steps done to create realistic mixed completion state
+        if len(all_steps) >= 1:
+            log_entry = DailyLog(
+                guest_id=guest_id,
+                date=current_date,
+                step_id=all_steps[0].id,
+                done=True,
+                memo="朝の活動完了",
+            )
+            db.add(log_entry)
+            messages.append(
+                f"Marked step '{all_steps[0].name}' as done for {current_date.isoformat()}"
+            )
+        if len(all_steps) >= 3:
+            log_entry = DailyLog(
+                guest_id=guest_id,
+                date=current_date,
+                step_id=all_steps[2].id,
+                done=True,
+                memo="メールチェック完了",
+            )
+            db.add(log_entry)
+            messages.append(
+                f"Marked step '{all_steps[2].name}' as done for {current_date.isoformat()}"
+            )
 
     db.commit()
     return messages
@@ -4,26 +4,54 @@ from __future__ import annotations
 
 import datetime
 import re
+import unicodedata
+from functools import lru_cache
 from typing import Any, Dict
 
 from dateutil import parser as date_parser
 
+# 日本語: 厳密な YYYY-MM-DD 形式(fullmatch で使用) / English: Strict YYYY-MM-DD shape, used with fullmatch
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+@lru_cache(maxsize=1024)
+def _fast_iso_date(text: str) -> datetime.date | None:
+    # 日本語: 正準 ISO 日付なら strptime/dateutil を通さず C 実装で変換 / English: Convert canonical ISO dates in C, bypassing strptime and dateutil
+    # 日本語: 同じ日付文字列がバッチ内の各アクションで繰り返されるため結果をキャッシュ / English: The same date strings recur across a batch's actions, so results are cached
+    if _ISO_DATE_RE.fullmatch(text):
+        try:
+            return datetime.date.fromisoformat(text)
+        except ValueError:
+            return None
+    return None
+
 
 def _parse_date(value: Any, default_date: datetime.date) -> datetime.date:
     # 日本語: 文字列/日付を date に寄せ、失敗時は default を返す / English: Coerce value into date, fallback to default on parse failure
     if isinstance(value, datetime.date):
         return value
     if isinstance(value, str) and value.strip():
-        try:
-            return datetime.datetime.strptime(value.strip(), "%Y-%m-%d").date()
-        except ValueError:
-            try:
-                return date_parser.parse(value).date()
-            except (ValueError, TypeError, OverflowError):
-                return default_date
+        text = value.strip()
+        fast = _fast_iso_date(text)
+        if fast is not None:
+            return fast
+        # 日本語: dateutil は欠けた年月日を「今日」で補うため、今日もキーに含めてキャッシュ / English: dateutil fills missing fields from today, so today is part of the cache key
+        return _parse_date_text(text, default_date, datetime.date.today())
     return default_date
 
 
+@lru_cache(maxsize=1024)
+def _parse_date_text(text: str, default_date: datetime.date, today: datetime.date) -> datetime.date:
+    # 日本語: 非正準な日付文字列の strptime/dateutil 解析結果をメモ化 / English: Memoize strptime/dateutil parsing of non-canonical date strings
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        try:
+            return date_parser.parse(text).date()
+        except (ValueError, TypeError, OverflowError):
+            return default_date
+
+
 def _safe_build_date(year: int, month: int, day: int) -> datetime.date | None:
     # 日本語: 不正日付を例外化せず None で扱う / English: Build date safely and return None for invalid calendar values
     try:
@@ -313,12 +341,46 @@ def _resolve_schedule_expression(
     default_time: str = "00:00",
 ) -> Dict[str, Any]:
     # 日本語: 日付+時刻を統合し、必要なら週範囲も返す / English: Resolve date/time expression and include week range when applicable
-    text = str(expression).strip() if expression is not None else ""
+    raw_text = str(expression).strip() if expression is not None else ""
+    # 日本語: 全角/半角・空白の表記揺れを正規化し、同じキャッシュキーへ寄せる / English: Normalize width and spacing variants so they share one cache key
+    text = _normalize_expression_text(raw_text)
     if not text:
         return {"ok": False, "error": "expression が空です。"}
 
     normalized_base_time = _normalize_hhmm(base_time, "00:00")
     normalized_default_time = _normalize_hhmm(default_time, normalized_base_time)
+    # 日本語: 解決結果は正規化済み入力で決まるためプロセス内でキャッシュし、呼び出し側にはコピーを返す / English: Results depend only on the normalized inputs, so cache them process-wide and hand callers a copy
+    resolved = _resolve_normalized_schedule_expression(
+        text, base_date, normalized_base_time, normalized_default_time
+    )
+    if not resolved["ok"]:
+        # 日本語: エラーには利用者が入力した表記をそのまま返す / English: Echo the expression as the user wrote it in the error
+        return {"ok": False, "error": f"日付表現を解釈できませんでした: {raw_text}"}
+    return dict(resolved)
+
+
+# 日本語: 解析用の正規表現はすべて \s* / \b で空白幅を許容するため、空白の畳み込みは結果を変えない / English: Every parsing pattern tolerates spacing via \s* or \b, so collapsing whitespace never changes the result
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+# 日本語: 日本語に接する空白(英単語側は \b 判定のため残す) / English: Whitespace touching Japanese text, except next to ASCII letters so English \b matching still works
+_NON_ASCII_ADJACENT_SPACE_RE = re.compile(
+    r"(?<=[^\x00-\x7f])\s+(?=[^A-Za-z])|(?<=[^A-Za-z])\s+(?=[^\x00-\x7f])"
+)
+
+
+def _normalize_expression_text(value: str) -> str:
+    # 日本語: NFKC で全角英数を半角化し、日本語と英字以外の間の空白は除去、残りの連続空白は1つに畳む(neologdn 相当の簡易版) / English: NFKC-fold full-width characters, drop spaces between Japanese text and non-letters, and collapse the rest (a light neologdn-style pass)
+    text = unicodedata.normalize("NFKC", value)
+    text = _NON_ASCII_ADJACENT_SPACE_RE.sub("", text)
+    return _WHITESPACE_RUN_RE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=4096)
+def _resolve_normalized_schedule_expression(
+    text: str,
+    base_date: datetime.date,
+    normalized_base_time: str,
+    normalized_default_time: str,
+) -> Dict[str, Any]:
     base_hour, base_minute = [int(part) for part in normalized_base_time.split(":")]
     base_datetime = datetime.datetime.combine(
         base_date, datetime.time(hour=base_hour, minute=base_minute)
@@ -341,10 +403,8 @@ def _resolve_schedule_expression(
 
     resolved_date, date_source = _resolve_date_expression(text, base_date)
     if resolved_date is None:
-        return {
-            "ok": False,
-            "error": f"日付表現を解釈できませんでした: {text}",
-        }
+        # 日本語: エラー文は元の表記を持つ呼び出し側で組み立てる / English: The caller, which holds the original wording, builds the error message
+        return {"ok": False}
 
     explicit_time = _extract_explicit_time(text)
     resolved_time = explicit_time or normalized_default_time
@@ -373,6 +433,35 @@ def _resolve_schedule_expression(
     return response
 
 
+# 日本語: 相対日時判定に使う語彙と正規表現(モジュール読込時に一度だけ構築) / English: Tokens and regexes for relative date detection, built once at import
+_RELATIVE_DATETIME_TOKENS = (
+    "今日",
+    "本日",
+    "明日",
+    "明後日",
+    "昨日",
+    "一昨日",
+    "来週",
+    "再来週",
+    "先週",
+    "今週",
+    "次の",
+    "今度の",
+    "きょう",
+    "あした",
+    "あさって",
+    "きのう",
+    "おととい",
+)
+# 日本語: 語彙を1本の正規表現にまとめ、C 実装で1回走査する / English: Fold the tokens into one alternation so a single C-level scan checks them all
+_RELATIVE_DATETIME_TOKEN_RE = re.compile("|".join(map(re.escape, _RELATIVE_DATETIME_TOKENS)))
+_RELATIVE_OFFSET_RE = re.compile(r"(\d+)\s*(日|週|週間|時間|分)\s*(後|前|まえ)")
+_JA_WEEKDAY_RE = re.compile(r"(月|火|水|木|金|土|日)(?:曜(?:日)?)")
+_EN_WEEKDAY_RE = re.compile(
+    r"\b(mon(day)?|tue(sday)?|wed(nesday)?|thu(rsday)?|fri(day)?|sat(urday)?|sun(day)?)\b"
+)
+
+
 def _is_relative_datetime_text(value: Any) -> bool:
     # 日本語: 相対日時表現を含むかの軽量判定 / English: Lightweight detection of relative date/time phrasing
     if not isinstance(value, str):
@@ -380,43 +469,25 @@ def _is_relative_datetime_text(value: Any) -> bool:
     text = value.strip()
     if not text:
         return False
+    return _has_relative_datetime_phrase(text)
 
-    relative_tokens = [
-        "今日",
-        "本日",
-        "明日",
-        "明後日",
-        "昨日",
-        "一昨日",
-        "来週",
-        "再来週",
-        "先週",
-        "今週",
-        "次の",
-        "今度の",
-        "きょう",
-        "あした",
-        "あさって",
-        "きのう",
-        "おととい",
-    ]
-    if any(token in text for token in relative_tokens):
-        return True
 
-    if re.search(r"(\d+)\s*(日|週|週間|時間|分)\s*(後|前|まえ)", text):
+@lru_cache(maxsize=1024)
+def _has_relative_datetime_phrase(text: str) -> bool:
+    # 日本語: 同じ文字列への正規表現4本の走査をメモ化 / English: Memoize the four regex scans for repeated strings
+    if _ISO_DATE_RE.fullmatch(text):
+        return False
+
+    if _RELATIVE_DATETIME_TOKEN_RE.search(text):
         return True
 
-    if re.search(r"(月|火|水|木|金|土|日)(?:曜(?:日)?)", text):
+    if _RELATIVE_OFFSET_RE.search(text):
         return True
 
-    lower = text.lower()
-    if re.search(
-        r"\b(mon(day)?|tue(sday)?|wed(nesday)?|thu(rsday)?|fri(day)?|sat(urday)?|sun(day)?)\b",
-        lower,
-    ):
+    if _JA_WEEKDAY_RE.search(text):
         return True
 
-    return False
+    return _EN_WEEKDAY_RE.search(text.lower()) is not None
 
 
 def _bool_from_value(value: Any, default: bool = False) -> bool:
@@ -434,6 +505,18 @@ def _bool_from_value(value: Any, default: bool = False) -> bool:
     return default
 
 
+@lru_cache(maxsize=512)
+def _parse_iso_date_text(text: str) -> datetime.date | None:
+    # 日本語: 同じ日付文字列は複数の calc で繰り返されるため結果をキャッシュ(date は不変) / English: The same date string recurs across calc actions, so the immutable result is cached
+    fast = _fast_iso_date(text)
+    if fast is not None:
+        return fast
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
 def _try_parse_iso_date(value: Any) -> datetime.date | None:
     # 日本語: YYYY-MM-DD のみ厳密に受理 / English: Parse strict YYYY-MM-DD date only
     if isinstance(value, datetime.date):
@@ -443,10 +526,7 @@ def _try_parse_iso_date(value: Any) -> datetime.date | None:
     text = value.strip()
     if not text:
         return None
-    try:
-        return datetime.datetime.strptime(text, "%Y-%m-%d").date()
-    except ValueError:
-        return None
+    return _parse_iso_date_text(text)
 
 
 _WEEKDAY_NAMES_JA = ["月曜日", "火曜日", "水曜日", "木曜日", "金曜日", "土曜日", "日曜日"]
@@ -566,9 +646,10 @@ def _get_date_info(target_date: datetime.date) -> Dict[str, Any]:
 def _requires_date_resolution(value: Any) -> bool:
     # 日本語: 相対表現など未解決日付を検出 / English: Detect unresolved/non-ISO date expressions
     """YYYY-MM-DD 形式でなければ日付解決が必要と判定する。"""
-    if not isinstance(value, str) or not value.strip():
+    if not isinstance(value, str):
         return False
-    return re.fullmatch(r"\d{4}-\d{2}-\d{2}", value.strip()) is None
+    text = value.strip()
+    return bool(text) and _ISO_DATE_RE.fullmatch(text) is None
 
 
 __all__ = [
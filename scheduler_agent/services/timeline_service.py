@@ -3,16 +3,31 @@
 from __future__ import annotations
 
 import datetime
-from typing import List
+from typing import Any, Dict, Iterable, List, Sequence
 
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from scheduler_agent.models import CustomTask, DailyLog, DayLog, Routine
 
+# 日本語: days カラムで有効な曜日トークン / English: Weekday tokens accepted in the days column
+_WEEKDAY_TOKENS = frozenset(str(weekday) for weekday in range(7))
+# 日本語: 呼び出し側は必ず routine.steps を辿るので既定でまとめて読み込む / English: Callers always walk routine.steps, so load them in one batched query by default
+_DEFAULT_ROUTINE_OPTIONS = (selectinload(Routine.steps),)
 
-def get_weekday_routines(db: Session, weekday_int: int, guest_id: str = "default") -> List[Routine]:
+
+def get_weekday_routines(
+    db: Session,
+    weekday_int: int,
+    guest_id: str = "default",
+    options: Sequence[Any] = _DEFAULT_ROUTINE_OPTIONS,
+) -> List[Routine]:
     # 日本語: days カラム(カンマ区切り)から該当曜日のルーチンを抽出 / English: Filter routines by weekday using comma-separated days column
-    all_routines = db.exec(select(Routine).where(Routine.guest_id == guest_id)).all()
+    statement = select(Routine).where(Routine.guest_id == guest_id)
+    if options:
+        # 日本語: 呼び出し側指定のロード戦略(selectinload 等)を適用 / English: Apply caller-supplied loader options (e.g. selectinload)
+        statement = statement.options(*options)
+    all_routines = db.exec(statement).all()
     matched = []
     for routine in all_routines:
         if str(weekday_int) in (routine.days or "").split(","):
@@ -20,6 +35,23 @@ def get_weekday_routines(db: Session, weekday_int: int, guest_id: str = "default
     return matched
 
 
+def bucket_routines_by_weekday(routines: Iterable[Routine]) -> Dict[int, List[Routine]]:
+    # 日本語: 取得済みルーチンを曜日(0-6)ごとに振り分け(クエリなし) / English: Bucket already-loaded routines by weekday (0-6) without querying
+    buckets: Dict[int, List[Routine]] = {weekday: [] for weekday in range(7)}
+    for routine in routines:
+        for token in set((routine.days or "").split(",")):
+            if token in _WEEKDAY_TOKENS:
+                buckets[int(token)].append(routine)
+    return buckets
+
+
+def date_range_filter(column: Any, start_date: datetime.date, end_date: datetime.date) -> tuple:
+    # 日本語: 両端含む日付範囲を半開区間 [start, end+1) の述語に変換 / English: Express an inclusive date range as half-open [start, end+1) predicates
+    if end_date >= datetime.date.max:
+        return (column >= start_date,)
+    return (column >= start_date, column < end_date + datetime.timedelta(days=1))
+
+
 def _get_timeline_data(db: Session, date_obj: datetime.date, guest_id: str = "default"):
     # 日本語: 指定日のルーチンステップ+カスタムタスクを時系列で構築 / English: Build chronological timeline from routine steps and custom tasks
     routines = get_weekday_routines(db, date_obj.weekday(), guest_id=guest_id)
@@ -31,16 +63,25 @@ def _get_timeline_data(db: Session, date_obj: datetime.date, guest_id: str = "de
     total_items = 0
     completed_items = 0
 
-    for routine in routines:
-        for step in routine.steps:
-            # 日本語: ステップごとの当日ログを紐づける / English: Attach per-step daily log for the target date
-            log = db.exec(
+    step_ids = [step.id for routine in routines for step in routine.steps]
+    logs_by_step_id: Dict[int, DailyLog] = {}
+    if step_ids:
+        # 日本語: 当日ログを IN 1回でまとめて取得 / English: Fetch the day's step logs with a single IN query
+        logs_by_step_id = {
+            log.step_id: log
+            for log in db.exec(
                 select(DailyLog).where(
                     DailyLog.date == date_obj,
-                    DailyLog.step_id == step.id,
+                    DailyLog.step_id.in_(step_ids),
                     DailyLog.guest_id == guest_id,
                 )
-            ).first()
+            ).all()
+        }
+
+    for routine in routines:
+        for step in routine.steps:
+            # 日本語: ステップごとの当日ログを紐づける / English: Attach per-step daily log for the target date
+            log = logs_by_step_id.get(step.id)
             timeline_items.append(
                 {
                     "type": "routine",
@@ -84,7 +125,9 @@ def _get_timeline_data(db: Session, date_obj: datetime.date, guest_id: str = "de
 def _build_scheduler_context(db: Session, today: datetime.date | None = None, guest_id: str = "default") -> str:
     # 日本語: LLM が参照する「本日中心」の状態テキストを生成 / English: Build "today-focused" context text for LLM consumption
     today = today or datetime.date.today()
-    routines = db.exec(select(Routine).where(Routine.guest_id == guest_id)).all()
+    routines = db.exec(
+        select(Routine).where(Routine.guest_id == guest_id).options(*_DEFAULT_ROUTINE_OPTIONS)
+    ).all()
     today_logs = {
         log.step_id: log
         for log in db.exec(
@@ -95,15 +138,21 @@ def _build_scheduler_context(db: Session, today: datetime.date | None = None, gu
         select(CustomTask).where(CustomTask.date == today, CustomTask.guest_id == guest_id)
     ).all()
 
+    # 日本語: 直近3日分の日報は範囲クエリ1回で取得 / English: Fetch the last three days of day logs with one range query
+    recent_start = today - datetime.timedelta(days=2)
+    recent_contents = {
+        day_log.date: day_log.content
+        for day_log in db.exec(
+            select(DayLog).where(DayLog.guest_id == guest_id, *date_range_filter(DayLog.date, recent_start, today))
+        ).all()
+    }
     recent_day_logs = []
     for i in range(3):
         # 日本語: 直近3日の日報を補助コンテキストとして添付 / English: Include recent 3-day logs as auxiliary context
         date_value = today - datetime.timedelta(days=i)
-        day_log = db.exec(
-            select(DayLog).where(DayLog.date == date_value, DayLog.guest_id == guest_id)
-        ).first()
-        if day_log and day_log.content:
-            recent_day_logs.append(f"Date: {date_value.isoformat()} | Content: {day_log.content}")
+        content = recent_contents.get(date_value)
+        if content:
+            recent_day_logs.append(f"Date: {date_value.isoformat()} | Content: {content}")
 
     routine_lines = []
     for routine in routines:
@@ -147,6 +196,8 @@ def _build_scheduler_context(db: Session, today: datetime.date | None = None, gu
 
 __all__ = [
     "get_weekday_routines",
+    "bucket_routines_by_weekday",
+    "date_range_filter",
     "_get_timeline_data",
     "_build_scheduler_context",
 ]
@@ -11,6 +11,8 @@ from typing import Any, Callable, Dict, List
 from fastapi import HTTPException, Request
 from fastapi.responses import RedirectResponse
 from sqlalchemy import delete as sa_delete
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from model_selection import apply_model_selection, current_available_models, update_override
@@ -24,6 +26,7 @@ from scheduler_agent.models import (
     Routine,
     Step,
 )
+from scheduler_agent.services.timeline_service import date_range_filter
 from scheduler_agent.web.error_handling import raise_internal_server_error
 from scheduler_agent.web.request_context import get_guest_id_from_request
 
@@ -104,6 +107,38 @@ def _scoped_delete_statement(delete_fn, model: Any, guest_id: str):
     return statement
 
 
+def _save_step_logs_from_form(
+    db: Session,
+    form: Any,
+    date_obj: datetime.date,
+    routines: List[Routine],
+    guest_id: str,
+) -> None:
+    # 日本語: 当日ログを IN 1回で取得し、無いステップだけ新規作成 / English: Fetch the day's step logs with one IN query and create rows only for missing steps
+    steps = [step for routine in routines for step in routine.steps]
+    if not steps:
+        return
+    logs_by_step_id = {
+        log.step_id: log
+        for log in db.exec(
+            select(DailyLog).where(
+                DailyLog.date == date_obj,
+                DailyLog.step_id.in_([step.id for step in steps]),
+                DailyLog.guest_id == guest_id,
+            )
+        ).all()
+    }
+    for step in steps:
+        log = logs_by_step_id.get(step.id)
+        if not log:
+            log = DailyLog(guest_id=guest_id, date=date_obj, step_id=step.id)
+            db.add(log)
+            logs_by_step_id[step.id] = log
+
+        log.done = form.get(f"done_{step.id}") == "on"
+        log.memo = form.get(f"memo_{step.id}", "")
+
+
 # 日本語: セッション内フラッシュメッセージをAPI形式で返す / English: Return session flash messages as API payload
 def api_flash(
     request: Request,
@@ -135,6 +170,48 @@ def api_calendar(
     cal = calendar.Calendar(firstweekday=0)
     month_days = cal.monthdatescalendar(year, month)
 
+    # 日本語: 表示グリッド全体(先頭日〜末尾日)で各クエリを絞り込む / English: Bound every grid query by the visible grid's first and last day
+    grid_start, grid_end = month_days[0][0], month_days[-1][-1]
+
+    # 日本語: 表示範囲全体の完了ステップ数を日付ごとに GROUP BY 1クエリで集計(ORM 行は作らない) / English: Count completed steps per date for the whole visible grid with one GROUP BY query, without building ORM rows
+    completed_by_date: Dict[datetime.date, int] = dict(
+        db.exec(
+            select(DailyLog.date, func.count())
+            .where(
+                *date_range_filter(DailyLog.date, grid_start, grid_end),
+                DailyLog.guest_id == guest_id,
+                DailyLog.done,
+            )
+            .group_by(DailyLog.date)
+        ).all()
+    )
+
+    # 日本語: カスタムタスクも範囲クエリ1回で取得し、(guest_id, date, time) 索引の範囲走査に乗せる / English: Fetch custom tasks with one range query too, served by a (guest_id, date, time) index range scan
+    tasks_by_date: Dict[datetime.date, List[CustomTask]] = {}
+    range_tasks = db.exec(
+        select(CustomTask).where(
+            CustomTask.guest_id == guest_id,
+            *date_range_filter(CustomTask.date, grid_start, grid_end),
+        )
+    ).all()
+    for task in range_tasks:
+        tasks_by_date.setdefault(task.date, []).append(task)
+
+    # 日本語: 本文のある日報の日付も範囲クエリ1回で集める / English: Collect the dates that have a non-blank day log with one range query as well
+    day_log_dates = {
+        day_log.date
+        for day_log in db.exec(
+            select(DayLog).where(
+                DayLog.guest_id == guest_id,
+                *date_range_filter(DayLog.date, grid_start, grid_end),
+            )
+        ).all()
+        if day_log.content and day_log.content.strip()
+    }
+
+    # 日本語: 曜日は7種類しかないのでルーチン数とステップ数を曜日ごとに1回だけ数える / English: Only seven weekdays exist, so count routines and steps once per weekday
+    counts_by_weekday: Dict[int, tuple[int, int]] = {}
+
     calendar_data = []
     for week in month_days:
         week_data = []
@@ -143,31 +220,28 @@ def api_calendar(
             is_current_month = day.month == month
 
             weekday = day.weekday()
-            routines = _call_get_weekday_routines(get_weekday_routines_fn, db, weekday, guest_id)
-            total_steps = sum(len(r.steps) for r in routines)
+            counts = counts_by_weekday.get(weekday)
+            if counts is None:
+                routines = _call_get_weekday_routines(get_weekday_routines_fn, db, weekday, guest_id)
+                counts = counts_by_weekday[weekday] = (len(routines), sum(len(r.steps) for r in routines))
+            routine_count, total_steps = counts
 
-            logs = db.exec(
-                select(DailyLog).where(DailyLog.date == day, DailyLog.guest_id == guest_id)
-            ).all()
-            completed_count = sum(1 for log in logs if log.done)
+            completed_count = completed_by_date.get(day, 0)
 
-            custom_tasks = db.exec(
-                select(CustomTask).where(CustomTask.date == day, CustomTask.guest_id == guest_id)
-            ).all()
+            custom_tasks = tasks_by_date.get(day, [])
             total_steps += len(custom_tasks)
             completed_count += sum(1 for task in custom_tasks if task.done)
 
-            day_log = db.exec(select(DayLog).where(DayLog.date == day, DayLog.guest_id == guest_id)).first()
-            has_day_log = bool(day_log and day_log.content and day_log.content.strip())
+            has_day_log = day in day_log_dates
 
             week_data.append(
                 {
                     "date": day.isoformat(),
                     "day_num": day.day,
                     "is_current_month": is_current_month,
-                    "routine_count": len(routines),
+                    "routine_count": routine_count,
                     "custom_task_count": len(custom_tasks),
-                    "total_routines": len(routines) + len(custom_tasks),
+                    "total_routines": routine_count + len(custom_tasks),
                     "total_steps": total_steps,
                     "completed_steps": completed_count,
                     "has_day_log": has_day_log,
@@ -257,29 +331,7 @@ async def agent_day_view(
 
         # 日本語: ルーチンステップとカスタムタスクのチェック状態を一括保存 / English: Persist completion/memo states for routine steps and custom tasks
         routines = _call_get_weekday_routines(get_weekday_routines_fn, db, date_obj.weekday(), guest_id)
-        all_steps = []
-        for routine in routines:
-            all_steps.extend(routine.steps)
-
-        for step in all_steps:
-            done_key = f"done_{step.id}"
-            memo_key = f"memo_{step.id}"
-            is_done = form.get(done_key) == "on"
-            memo_text = form.get(memo_key, "")
-
-            log = db.exec(
-                select(DailyLog).where(
-                    DailyLog.date == date_obj,
-                    DailyLog.step_id == step.id,
-                    DailyLog.guest_id == guest_id,
-                )
-            ).first()
-            if not log:
-                log = DailyLog(guest_id=guest_id, date=date_obj, step_id=step.id)
-                db.add(log)
-
-            log.done = is_done
-            log.memo = memo_text
+        _save_step_logs_from_form(db, form, date_obj, routines, guest_id)
 
         custom_tasks = db.exec(
             select(CustomTask).where(CustomTask.date == date_obj, CustomTask.guest_id == guest_id)
@@ -441,29 +493,7 @@ async def day_view(
 
         # 日本語: 画面全体の進捗入力を日次ログへ反映 / English: Persist full-page progress inputs into daily logs
         routines = _call_get_weekday_routines(get_weekday_routines_fn, db, date_obj.weekday(), guest_id)
-        all_steps = []
-        for routine in routines:
-            all_steps.extend(routine.steps)
-
-        for step in all_steps:
-            done_key = f"done_{step.id}"
-            memo_key = f"memo_{step.id}"
-            is_done = form.get(done_key) == "on"
-            memo_text = form.get(memo_key, "")
-
-            log = db.exec(
-                select(DailyLog).where(
-                    DailyLog.date == date_obj,
-                    DailyLog.step_id == step.id,
-                    DailyLog.guest_id == guest_id,
-                )
-            ).first()
-            if not log:
-                log = DailyLog(guest_id=guest_id, date=date_obj, step_id=step.id)
-                db.add(log)
-
-            log.done = is_done
-            log.memo = memo_text
+        _save_step_logs_from_form(db, form, date_obj, routines, guest_id)
 
         custom_tasks = db.exec(
             select(CustomTask).where(CustomTask.date == date_obj, CustomTask.guest_id == guest_id)
@@ -505,7 +535,10 @@ def api_routines_by_day(weekday: int, db: Session, *, get_weekday_routines_fn, r
 # 日本語: 全ルーチン一覧API / English: API for listing all routines
 def api_routines(db: Session, request: Request | None = None):
     guest_id = _resolve_guest_id(request)
-    routines = db.exec(select(Routine).where(Routine.guest_id == guest_id)).all()
+    # 日本語: steps は IN 1回で先読みし、ルーチンごとの遅延ロードを避ける / English: Preload steps with one IN query instead of lazy-loading them per routine
+    routines = db.exec(
+        select(Routine).where(Routine.guest_id == guest_id).options(selectinload(Routine.steps))
+    ).all()
     serialized_routines = []
     for routine in routines:
         steps = []
@@ -0,0 +1,747 @@
+import datetime
+
+from sqlalchemy import create_engine, event
+from sqlmodel import SQLModel, Session, select
+
+from scheduler_agent.models import CustomTask, DailyLog, DayLog, Routine, Step
+from scheduler_agent.services.action_service import _apply_actions
+from scheduler_agent.services.timeline_service import (
+    _build_scheduler_context,
+    _get_timeline_data,
+    get_weekday_routines,
+)
+
+
+def _session_factory() -> Session:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            Routine.__table__,
+            Step.__table__,
+            DailyLog.__table__,
+            CustomTask.__table__,
+            DayLog.__table__,
+        ],
+    )
+    return Session(engine)
+
+
+def _capture_statements(db: Session) -> list[str]:
+    statements: list[str] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _before_cursor_execute)
+    return statements
+
+
+def _seed_daily_routine(db: Session) -> tuple[Routine, list[Step]]:
+    routine = Routine(name="Morning", days="0,1,2,3,4,5,6")
+    db.add(routine)
+    db.flush()
+    steps = [
+        Step(routine_id=routine.id, name="Stretch", time="06:30"),
+        Step(routine_id=routine.id, name="Coffee", time="07:00", memo="豆"),
+    ]
+    db.add_all(steps)
+    db.flush()
+    return routine, steps
+
+
+def test_list_tasks_in_period_fetches_step_logs_in_one_query():
+    db = _session_factory()
+    start = datetime.date(2026, 3, 23)
+    try:
+        _, steps = _seed_daily_routine(db)
+        db.add(DailyLog(date=start, step_id=steps[0].id, done=True, memo="ok"))
+        db.add(DailyLog(date=start + datetime.timedelta(days=2), step_id=steps[1].id, done=True))
+        db.commit()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {
+                    "type": "list_tasks_in_period",
+                    "start_date": start.isoformat(),
+                    "end_date": (start + datetime.timedelta(days=9)).isoformat(),
+                }
+            ],
+            start,
+        )
+
+        assert errors == []
+        lines = results[0].splitlines()[1:]
+        assert len(lines) == 20
+        assert f"ルーチンステップ [{steps[0].id}]: 2026-03-23 06:30 - Morning - Stretch (完了: 完了) (メモ: ok)" in lines
+        assert f"ルーチンステップ [{steps[1].id}]: 2026-03-25 07:00 - Morning - Coffee (完了: 完了) (メモ: 豆)" in lines
+        assert f"ルーチンステップ [{steps[1].id}]: 2026-03-24 07:00 - Morning - Coffee (完了: 未完了) (メモ: 豆)" in lines
+        assert sum("FROM daily_log" in statement for statement in statements) == 1
+        assert sum("FROM custom_task" in statement for statement in statements) == 1
+    finally:
+        db.close()
+
+
+def test_get_daily_summary_uses_step_log_index():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        _, steps = _seed_daily_routine(db)
+        db.add(DailyLog(date=target, step_id=steps[1].id, done=True, memo="済"))
+        db.commit()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [{"type": "get_daily_summary", "date": target.isoformat()}],
+            target,
+        )
+
+        assert errors == []
+        assert "- 06:30 Morning - Stretch (未完了) (メモ: なし)" in results[0]
+        assert "- 07:00 Morning - Coffee (完了) (メモ: 済)" in results[0]
+        assert sum("FROM daily_log" in statement for statement in statements) == 1
+    finally:
+        db.close()
+
+
+def test_list_tasks_in_period_loads_routine_steps_in_one_query():
+    db = _session_factory()
+    start = datetime.date(2026, 3, 23)
+    try:
+        _seed_daily_routine(db)
+        evening = Routine(name="Evening", days="0,1,2,3,4,5,6")
+        db.add(evening)
+        db.flush()
+        db.add(Step(routine_id=evening.id, name="Read", time="21:00"))
+        db.commit()
+        db.expire_all()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {
+                    "type": "list_tasks_in_period",
+                    "start_date": start.isoformat(),
+                    "end_date": (start + datetime.timedelta(days=2)).isoformat(),
+                }
+            ],
+            start,
+        )
+
+        assert errors == []
+        assert len(results[0].splitlines()) == 1 + 3 * 3
+        step_queries = [statement for statement in statements if "FROM step" in statement]
+        assert len(step_queries) == 1
+        assert "step.routine_id IN" in step_queries[0]
+    finally:
+        db.close()
+
+
+def test_weekday_routines_are_fetched_once_per_batch_until_routines_change():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        routine, _ = _seed_daily_routine(db)
+        routine_id = routine.id
+        db.commit()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "get_daily_summary", "date": target.isoformat()},
+                {"type": "list_tasks_in_period", "start_date": "2026-03-23", "end_date": "2026-03-29"},
+                {"type": "update_routine_days", "routine_id": routine_id, "new_days": "0"},
+                {"type": "get_daily_summary", "date": target.isoformat()},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert "Morning - Stretch" in results[0]
+        assert "ルーチンステップ: なし" in results[3]
+        weekday_fetches = [
+            statement
+            for statement in statements
+            if "FROM routine" in statement and "routine.id IN" not in statement
+        ]
+        assert len(weekday_fetches) == 2
+    finally:
+        db.close()
+
+
+def test_referenced_rows_are_prefetched_once_per_model():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        _, steps = _seed_daily_routine(db)
+        tasks = [CustomTask(date=target, name=f"task{index}", time="10:00") for index in range(3)]
+        db.add_all(tasks)
+        db.commit()
+        step_ids = [step.id for step in steps]
+        task_ids = [task.id for task in tasks]
+        db.expunge_all()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                *({"type": "rename_custom_task", "task_id": task_id, "new_name": "renamed"} for task_id in task_ids),
+                *({"type": "update_step_time", "step_id": step_id, "new_time": "08:00"} for step_id in step_ids),
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert len(results) == 5
+        selects = [statement for statement in statements if statement.startswith("SELECT")]
+        assert sum("FROM custom_task" in statement for statement in selects) == 1
+        assert sum("FROM step" in statement for statement in selects) == 1
+    finally:
+        db.close()
+
+
+def test_rows_created_earlier_in_the_batch_can_be_referenced():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        _, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "create_custom_task", "name": "歯医者", "date": target.isoformat()},
+                {"type": "delete_custom_task", "task_id": 1},
+                {"type": "add_routine", "name": "Morning", "days": "0,1,2,3,4,5,6"},
+                {"type": "add_step", "routine_id": 1, "name": "Stretch", "time": "06:30"},
+                {"type": "rename_step", "step_id": 1, "new_name": "Yoga"},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert db.exec(select(CustomTask)).all() == []
+        assert [step.name for step in db.exec(select(Step)).all()] == ["Yoga"]
+    finally:
+        db.close()
+
+
+def test_custom_task_actions_share_one_prefetch_query():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        tasks = [CustomTask(date=target, name=f"task{index}") for index in range(5)]
+        db.add_all(tasks)
+        db.commit()
+        ids = [task.id for task in tasks]
+        db.expunge_all()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "toggle_custom_task", "task_id": ids[0], "done": True},
+                {"type": "update_custom_task_time", "task_id": ids[1], "new_time": "10:00"},
+                {"type": "rename_custom_task", "task_id": ids[2], "new_name": "renamed"},
+                {"type": "update_custom_task_memo", "task_id": ids[3], "new_memo": "memo"},
+                {"type": "delete_custom_task", "task_id": ids[4]},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert len(results) == 5
+        selects = [statement for statement in statements if statement.startswith("SELECT")]
+        assert sum("FROM custom_task" in statement for statement in selects) == 1
+    finally:
+        db.close()
+
+
+def test_toggle_step_upserts_single_daily_log_row():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        _, steps = _seed_daily_routine(db)
+        step_id = steps[0].id
+        db.commit()
+
+        statements = _capture_statements(db)
+        results, errors, modified_ids = _apply_actions(
+            db,
+            [
+                {"type": "toggle_step", "step_id": step_id, "date": target.isoformat(), "memo": "朝"},
+                {"type": "get_daily_summary", "date": target.isoformat()},
+                {"type": "toggle_step", "step_id": step_id, "date": target.isoformat(), "done": False},
+                {"type": "get_daily_summary", "date": target.isoformat()},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert "- 06:30 Morning - Stretch (完了) (メモ: 朝)" in results[1]
+        assert "- 06:30 Morning - Stretch (未完了) (メモ: 朝)" in results[3]
+        logs = db.exec(select(DailyLog)).all()
+        assert [(log.step_id, log.done, log.memo) for log in logs] == [(step_id, False, "朝")]
+        upserts = [statement for statement in statements if statement.startswith("INSERT INTO daily_log")]
+        assert len(upserts) == 2
+        assert modified_ids == [f"item_routine_{step_id}"]
+    finally:
+        db.close()
+
+
+def test_list_tasks_in_period_formats_custom_tasks_without_orm_instances():
+    db = _session_factory()
+    start = datetime.date(2026, 3, 25)
+    try:
+        db.add_all(
+            [
+                CustomTask(date=start + datetime.timedelta(days=1), name="買い物", time="18:00"),
+                CustomTask(date=start, name="歯医者", time="09:00", done=True, memo="保険証"),
+            ]
+        )
+        db.commit()
+        ids = [task.id for task in db.exec(select(CustomTask).order_by(CustomTask.id)).all()]
+        db.expunge_all()
+
+        results, errors, _ = _apply_actions(
+            db,
+            [{"type": "list_tasks_in_period", "start_date": "2026-03-25", "end_date": "2026-03-26"}],
+            start,
+        )
+
+        assert errors == []
+        assert results[0].splitlines()[1:] == [
+            f"カスタムタスク [{ids[1]}]: 2026-03-25 09:00 - 歯医者 (完了: True) (メモ: 保険証)",
+            f"カスタムタスク [{ids[0]}]: 2026-03-26 18:00 - 買い物 (完了: False) (メモ: なし)",
+        ]
+        assert not any(isinstance(obj, CustomTask) for obj in db.identity_map.values())
+    finally:
+        db.close()
+
+
+def test_list_tasks_in_period_expands_only_scheduled_weekdays():
+    db = _session_factory()
+    start = datetime.date(2026, 3, 27)  # Friday
+    try:
+        routine = Routine(name="Weekly", days="0,6")
+        db.add(routine)
+        db.flush()
+        db.add(Step(routine_id=routine.id, name="Plan", time="09:00"))
+        db.commit()
+
+        results, errors, _ = _apply_actions(
+            db,
+            [{"type": "list_tasks_in_period", "start_date": "2026-03-27", "end_date": "2026-04-06"}],
+            start,
+        )
+
+        assert errors == []
+        dates = [line.split(": ", 1)[1].split(" ", 1)[0] for line in results[0].splitlines()[1:]]
+        assert dates == ["2026-03-29", "2026-03-30", "2026-04-05", "2026-04-06"]
+    finally:
+        db.close()
+
+
+def test_day_log_actions_upsert_one_row_per_guest_and_date():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "append_day_log", "date": target.isoformat(), "content": "朝: 散歩"},
+                {"type": "append_day_log", "date": target.isoformat(), "content": "昼: 読書"},
+                {"type": "get_day_log", "date": target.isoformat()},
+                {"type": "update_log", "date": target.isoformat(), "content": "書き直し"},
+                {"type": "get_day_log", "date": target.isoformat()},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert results[2] == "2026-03-25 の日報:\n朝: 散歩\n昼: 読書"
+        assert results[4] == "2026-03-25 の日報:\n書き直し"
+        assert [log.content for log in db.exec(select(DayLog)).all()] == ["書き直し"]
+    finally:
+        db.close()
+
+
+def test_delete_routine_matches_normalized_name_variants():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        db.add_all([Routine(name="朝　の 準備"), Routine(name="夜の散歩")])
+        db.commit()
+
+        results, errors, _ = _apply_actions(
+            db,
+            [{"type": "delete_routine", "routine_name": "「朝の準備ルーチン」"}],
+            target,
+        )
+
+        assert errors == []
+        assert results == ["ルーチン「朝　の 準備」を削除しました。"]
+        assert [routine.name for routine in db.exec(select(Routine)).all()] == ["夜の散歩"]
+    finally:
+        db.close()
+
+
+def test_delete_routine_matches_ascii_names_case_and_space_insensitively():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        db.add_all([Routine(name="Morning  Stretch"), Routine(name="Evening Walk")])
+        db.commit()
+
+        results, errors, _ = _apply_actions(
+            db,
+            [{"type": "delete_routine", "routine_name": " 'morning\tSTRETCH routine' "}],
+            target,
+        )
+
+        assert errors == []
+        assert results == ["ルーチン「Morning  Stretch」を削除しました。"]
+        assert [routine.name for routine in db.exec(select(Routine)).all()] == ["Evening Walk"]
+    finally:
+        db.close()
+
+
+def test_delete_routine_batch_loads_guest_routines_once():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        db.add_all([Routine(name="朝の準備"), Routine(name="夜の散歩"), Routine(name="週末の掃除")])
+        db.commit()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "delete_routine", "routine_name": "朝の準備"},
+                {"type": "delete_routine", "routine_name": "夜の散歩"},
+                {"type": "delete_routine", "routine_name": "朝の準備"},
+            ],
+            target,
+        )
+
+        assert results == ["ルーチン「朝の準備」を削除しました。", "ルーチン「夜の散歩」を削除しました。"]
+        assert len(errors) == 1 and "朝の準備" in errors[0]
+        routine_selects = [
+            statement
+            for statement in statements
+            if statement.startswith("SELECT") and "FROM routine" in statement
+        ]
+        assert len(routine_selects) == 1
+        assert [routine.name for routine in db.exec(select(Routine)).all()] == ["週末の掃除"]
+    finally:
+        db.close()
+
+
+def test_delete_routines_by_id_preload_steps_for_the_cascade():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        routines = [Routine(name=f"routine{index}") for index in range(3)]
+        db.add_all(routines)
+        db.flush()
+        db.add_all([Step(routine_id=routine.id, name="step") for routine in routines])
+        db.commit()
+        ids = [routine.id for routine in routines]
+        db.expunge_all()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [{"type": "delete_routine", "routine_id": routine_id} for routine_id in ids],
+            target,
+        )
+
+        assert errors == []
+        assert len(results) == 3
+        selects = [statement for statement in statements if statement.startswith("SELECT")]
+        assert sum("FROM step" in statement for statement in selects) == 1
+        assert db.exec(select(Step)).all() == []
+    finally:
+        db.close()
+
+
+def test_day_logs_for_batch_dates_are_fetched_in_one_query():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        db.add(DayLog(date=target, content="散歩"))
+        db.commit()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "get_day_log", "date": "2026-03-24"},
+                {"type": "get_day_log", "date": "2026-03-25"},
+                {"type": "get_daily_summary", "date": "2026-03-25"},
+                {"type": "get_day_log", "date": "2026-03-26"},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert results[0] == "2026-03-24 の日報は見つかりませんでした。"
+        assert results[1] == "2026-03-25 の日報:\n散歩"
+        assert "日報: 散歩" in results[2]
+        assert sum("FROM day_log" in statement for statement in statements) == 1
+    finally:
+        db.close()
+
+
+def test_created_rows_share_the_batch_timestamp():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "create_tasks_in_range", "name": "ストレッチ", "start_date": "2026-03-25", "end_date": "2026-03-27"},
+                {"type": "add_routine", "name": "Evening"},
+            ],
+            target,
+        )
+
+        assert errors == []
+        stamps = {task.created_at for task in db.exec(select(CustomTask)).all()}
+        stamps |= {routine.created_at for routine in db.exec(select(Routine)).all()}
+        assert len(stamps) == 1
+    finally:
+        db.close()
+
+
+def test_create_tasks_in_range_inserts_rows_in_one_statement():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 1)
+    try:
+        statements = _capture_statements(db)
+        results, errors, modified_ids = _apply_actions(
+            db,
+            [{"type": "create_tasks_in_range", "name": "散歩", "start_date": "2026-03-01", "end_date": "2026-03-05", "memo": " 公園 "}],
+            target,
+        )
+
+        assert errors == []
+        assert modified_ids == [f"item_custom_2026-03-0{day}" for day in range(1, 6)]
+        assert sum(statement.startswith("INSERT INTO custom_task") for statement in statements) == 1
+        tasks = db.exec(select(CustomTask).order_by(CustomTask.date)).all()
+        assert [(task.date.day, task.name, task.memo, task.done) for task in tasks] == [
+            (day, "散歩", "公園", False) for day in range(1, 6)
+        ]
+    finally:
+        db.close()
+
+
+def test_timeline_fetches_step_logs_in_one_query():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        _, steps = _seed_daily_routine(db)
+        db.add(DailyLog(date=target, step_id=steps[1].id, done=True, memo="済"))
+        db.commit()
+
+        statements = _capture_statements(db)
+        items, rate = _get_timeline_data(db, target)
+
+        assert [(item["step"].name, bool(item["log"] and item["log"].done)) for item in items] == [
+            ("Stretch", False),
+            ("Coffee", True),
+        ]
+        assert rate == 50
+        assert sum("FROM daily_log" in statement for statement in statements) == 1
+    finally:
+        db.close()
+
+
+def test_get_weekday_routines_eager_loads_steps():
+    db = _session_factory()
+    try:
+        _seed_daily_routine(db)
+        db.add(Routine(name="Evening", days="0"))
+        db.commit()
+        db.expire_all()
+
+        statements = _capture_statements(db)
+        routines = get_weekday_routines(db, 0)
+        step_names = {r.name: [step.name for step in r.steps] for r in routines}
+
+        assert step_names == {"Morning": ["Stretch", "Coffee"], "Evening": []}
+        assert sum("FROM step" in statement for statement in statements) == 1
+    finally:
+        db.close()
+
+
+def test_delete_tasks_in_range_keeps_both_ends_inclusive():
+    db = _session_factory()
+    start = datetime.date(2026, 3, 23)
+    try:
+        for offset in range(-1, 4):
+            db.add(CustomTask(date=start + datetime.timedelta(days=offset), name=f"t{offset}"))
+        db.commit()
+
+        _, errors, _ = _apply_actions(
+            db,
+            [{"type": "delete_tasks_in_range", "start_date": "2026-03-23", "end_date": "2026-03-25"}],
+            start,
+        )
+
+        assert errors == []
+        assert sorted(task.name for task in db.exec(select(CustomTask)).all()) == ["t-1", "t3"]
+    finally:
+        db.close()
+
+
+def test_reads_after_writes_in_a_mixed_batch_see_flushed_rows():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "create_custom_task", "name": "歯医者", "date": target.isoformat()},
+                {"type": "get_daily_summary", "date": target.isoformat()},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert "- 00:00 歯医者 (未完了) (メモ: なし)" in results[1]
+    finally:
+        db.close()
+
+
+def test_daily_summary_reads_day_log_tasks_and_step_logs_in_one_round_trip():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        _, steps = _seed_daily_routine(db)
+        db.add(DailyLog(date=target, step_id=steps[1].id, done=True, memo="済"))
+        db.add(DayLog(date=target, content="日記"))
+        db.add(CustomTask(date=target, name="歯医者", time="09:00", done=True, memo="保険証"))
+        db.commit()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(db, [{"type": "get_daily_summary", "date": target.isoformat()}], target)
+
+        assert errors == []
+        assert "日報: 日記" in results[0]
+        assert "- 09:00 歯医者 (完了) (メモ: 保険証)" in results[0]
+        assert "- 07:00 Morning - Coffee (完了) (メモ: 済)" in results[0]
+        touching = [s for s in statements if "FROM day_log" in s or "FROM custom_task" in s or "FROM daily_log" in s]
+        assert len(touching) == 1 and "UNION ALL" in touching[0]
+        assert all(table in touching[0] for table in ("FROM day_log", "FROM custom_task", "FROM daily_log"))
+    finally:
+        db.close()
+
+
+def test_repeated_reads_reuse_output_until_a_write():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    period = {"type": "list_tasks_in_period", "start_date": "2026-03-25", "end_date": "2026-03-26"}
+    try:
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                period,
+                dict(period),
+                {"type": "create_custom_task", "name": "歯医者", "date": target.isoformat()},
+                dict(period),
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert results[0] == results[1]
+        assert "歯医者" not in results[1]
+        assert "歯医者" in results[3]
+        assert sum("FROM custom_task" in statement for statement in statements) == 2
+    finally:
+        db.close()
+
+
+def test_same_step_across_actions_is_selected_once_and_deletes_are_respected():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        _, steps = _seed_daily_routine(db)
+        db.commit()
+        step_id = steps[0].id
+        db.expunge_all()
+
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "rename_step", "step_id": step_id, "new_name": "Yoga"},
+                {"type": "update_step_memo", "step_id": step_id, "new_memo": "mat"},
+                {"type": "update_step_time", "step_id": step_id, "new_time": "06:00"},
+                {"type": "delete_step", "step_id": step_id},
+                {"type": "rename_step", "step_id": step_id, "new_name": "Ghost"},
+            ],
+            target,
+        )
+
+        assert len(results) == 4
+        assert errors == [f"step_id={step_id} が見つかりませんでした。"]
+        selects = [statement for statement in statements if statement.startswith("SELECT")]
+        assert sum("FROM step" in statement for statement in selects) == 2
+    finally:
+        db.close()
+
+
+def test_day_logs_written_earlier_in_the_batch_are_not_prefetched():
+    db = _session_factory()
+    target = datetime.date(2026, 3, 25)
+    try:
+        statements = _capture_statements(db)
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "update_log", "date": "2026-03-25", "content": "散歩"},
+                {"type": "get_day_log", "date": "2026-03-25"},
+                {"type": "get_day_log", "date": "2026-03-26"},
+            ],
+            target,
+        )
+
+        assert errors == []
+        assert results[1] == "2026-03-25 の日報:\n散歩"
+        assert results[2] == "2026-03-26 の日報は見つかりませんでした。"
+        selects = [statement for statement in statements if statement.startswith("SELECT")]
+        assert sum("FROM day_log" in statement for statement in selects) == 1
+    finally:
+        db.close()
+
+
+def test_scheduler_context_reads_recent_day_logs_in_one_query():
+    db = _session_factory()
+    today = datetime.date(2026, 3, 25)
+    try:
+        db.add_all(
+            [
+                DayLog(date=today, content="today"),
+                DayLog(date=today - datetime.timedelta(days=2), content="two days ago"),
+                DayLog(date=today - datetime.timedelta(days=3), content="too old"),
+                DayLog(guest_id="other", date=today, content="other guest"),
+            ]
+        )
+        db.commit()
+
+        statements = _capture_statements(db)
+        context = _build_scheduler_context(db, today)
+
+        recent = context.split("recent_day_logs:\n", 1)[1].splitlines()
+        assert recent == [
+            "Date: 2026-03-25 | Content: today",
+            "Date: 2026-03-23 | Content: two days ago",
+        ]
+        assert sum("FROM day_log" in statement for statement in statements) == 1
+    finally:
+        db.close()
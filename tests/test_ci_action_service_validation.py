@@ -1,9 +1,11 @@
 import datetime
+import json
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlmodel import SQLModel, Session, select
 
 from scheduler_agent.models import CustomTask
+from scheduler_agent.services import action_service
 from scheduler_agent.services.action_service import _apply_actions
 
 
@@ -46,3 +48,186 @@ def test_apply_actions_rejects_invalid_type_shape():
         assert errors == ["アクション type が不正です。"]
     finally:
         db.close()
+
+
+def test_every_whitelisted_action_type_has_a_handler():
+    assert set(action_service._ALLOWED_ACTION_TYPES) == set(action_service._ACTION_HANDLERS)
+
+
+def test_action_classification_stays_in_sync_with_handlers():
+    assert isinstance(action_service.READ_ONLY_ACTION_TYPES, frozenset)
+    assert action_service._CALC_ACTION_TYPES <= action_service.READ_ONLY_ACTION_TYPES
+    assert action_service.READ_ONLY_ACTION_TYPES <= action_service._KNOWN_ACTION_TYPES
+    assert action_service._ROUTINE_MUTATING_ACTION_TYPES <= action_service._KNOWN_ACTION_TYPES
+    assert not action_service.READ_ONLY_ACTION_TYPES & action_service._ROUTINE_MUTATING_ACTION_TYPES
+
+
+def test_calc_results_keep_the_json_dumps_format():
+    db = _session_factory()
+    try:
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "get_date_info", "date": "2026-03-25"},
+                {"type": "calc_time_offset", "base_date": "2026-03-25", "base_time": "23:30", "offset_minutes": 45},
+            ],
+            datetime.date(2026, 3, 25),
+        )
+
+        assert errors == []
+        assert results == [
+            "計算結果(get_date_info): "
+            + json.dumps(action_service._get_date_info(datetime.date(2026, 3, 25)), ensure_ascii=False),
+            "計算結果(calc_time_offset): "
+            + json.dumps(
+                action_service._calc_time_offset(datetime.date(2026, 3, 25), "23:30", 45),
+                ensure_ascii=False,
+            ),
+        ]
+        assert set(action_service._CALC_RESULT_PREFIXES) == action_service._CALC_ACTION_TYPES
+        assert set(action_service._CALC_FUNCTIONS) == action_service._CALC_ACTION_TYPES
+    finally:
+        db.close()
+
+
+def test_repeated_calc_actions_reuse_the_cached_output():
+    db = _session_factory()
+    action_service._cached_calc_output.cache_clear()
+    try:
+        action = {"type": "calc_month_boundary", "year": 2026, "month": 2, "boundary": "end"}
+        results, errors, _ = _apply_actions(
+            db,
+            [action, dict(action, year="2026"), dict(action, month=13)],
+            datetime.date(2026, 3, 25),
+        )
+
+        assert len(results) == 2
+        assert results[0] == results[1]
+        assert errors == ["calc_month_boundary: month は 1〜12 で指定してください: 13"]
+        info = action_service._cached_calc_output.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+    finally:
+        db.close()
+
+
+def test_failed_mutating_action_only_rolls_back_its_own_savepoint(monkeypatch):
+    db = _session_factory()
+    today = datetime.date(2026, 3, 25)
+
+    def _broken_handler(ctx, action):
+        ctx.db.add(CustomTask(date=today, name="途中", time="09:00"))
+        ctx.db.flush()
+        ctx.results.append("書きかけ")
+        raise RuntimeError("boom")
+
+    handlers = dict(action_service._ALLOWED_ACTION_HANDLERS, rename_custom_task=_broken_handler)
+    monkeypatch.setattr(action_service, "_ALLOWED_ACTION_HANDLERS", handlers)
+    try:
+        actions = [
+            {"type": "create_custom_task", "name": "前", "date": today.isoformat()},
+            {"type": "rename_custom_task", "task_id": 1, "new_name": "x"},
+            {"type": "create_custom_task", "name": "後", "date": today.isoformat()},
+        ]
+
+        results, errors, _ = _apply_actions(db, actions, today)
+
+        assert errors == ["rename_custom_task: 操作の適用に失敗しました: boom"]
+        assert len(results) == 2
+        assert "書きかけ" not in results
+        names = sorted(task.name for task in db.exec(select(CustomTask)).all())
+        assert names == ["前", "後"]
+    finally:
+        db.close()
+
+
+def test_read_only_batch_skips_commit(monkeypatch):
+    db = _session_factory()
+    today = datetime.date(2026, 3, 25)
+    commits = []
+    monkeypatch.setattr(db, "commit", lambda: commits.append(True))
+    try:
+        actions = [
+            {"type": "calc_date_offset", "base_date": today.isoformat(), "offset_days": 1},
+            {"type": " get_date_info ", "date": today.isoformat()},
+        ]
+
+        assert action_service._is_read_only_batch(action_service._typed_actions(actions))
+        results, errors, _ = _apply_actions(db, actions, today)
+
+        assert errors == []
+        assert len(results) == 2
+        assert commits == []
+        assert not action_service._is_read_only_batch(
+            action_service._typed_actions(actions + [{"type": "create_custom_task"}])
+        )
+        assert action_service._is_read_only_batch(
+            action_service._typed_actions(actions + [{"type": 3}, {"type": "drop_all_tables"}])
+        )
+    finally:
+        db.close()
+
+
+def test_calc_only_batch_never_opens_a_transaction():
+    db = _session_factory()
+    today = datetime.date(2026, 3, 25)
+    begins = []
+    event.listen(db, "after_begin", lambda *_args: begins.append(True))
+    try:
+        results, errors, _ = _apply_actions(
+            db,
+            [
+                {"type": "calc_week_range", "base_date": today.isoformat()},
+                {"type": "get_date_info", "date": today.isoformat()},
+            ],
+            today,
+        )
+
+        assert errors == []
+        assert len(results) == 2
+        assert begins == []
+        assert not db.in_transaction()
+    finally:
+        db.close()
+
+
+def test_invalid_primary_keys_are_reported_without_failing_the_batch():
+    db = _session_factory()
+    today = datetime.date(2026, 3, 25)
+    try:
+        actions = [
+            {"type": "delete_custom_task", "task_id": "abc"},
+            {"type": "delete_step", "step_id": "abc"},
+            {"type": "create_custom_task", "name": "残る", "date": today.isoformat()},
+        ]
+
+        results, errors, _ = _apply_actions(db, actions, today)
+
+        assert errors == ["delete_custom_task: task_id が不正です。", "delete_step: not found"]
+        assert len(results) == 1
+        assert action_service._coerce_pk(7) == 7
+        assert action_service._coerce_pk(" 7 ") == 7
+        assert action_service._coerce_pk(None) is None
+    finally:
+        db.close()
+
+
+def test_step_updates_reject_malformed_input_before_querying():
+    db = _session_factory()
+    today = datetime.date(2026, 3, 25)
+    try:
+        actions = [
+            {"type": "rename_step", "step_id": "abc", "new_name": "x"},
+            {"type": "update_step_time", "new_time": ""},
+            {"type": "update_step_memo", "step_id": None, "new_memo": ""},
+        ]
+
+        results, errors, _ = _apply_actions(db, actions, today)
+
+        assert results == []
+        assert errors == [
+            "rename_step: step_id が不正です。",
+            "update_step_time: new_time が指定されていません。",
+            "update_step_memo: step_id が不正です。",
+        ]
+    finally:
+        db.close()
@@ -97,6 +97,23 @@ def test_get_max_output_tokens_defaults_and_clamps(monkeypatch):
     assert core_config.get_max_output_tokens() == 5000
 
 
+def test_ensure_dotenv_loads_only_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(core_config, "load_dotenv", lambda *args, **kwargs: calls.append(kwargs))
+    monkeypatch.delenv("SCHEDULER_SKIP_DOTENV", raising=False)
+
+    monkeypatch.setattr(core_config, "_DOTENV_LOADED", False)
+    core_config._ensure_dotenv()
+    core_config._ensure_dotenv()
+    assert calls == [{"override": False, "verbose": False}]
+
+    monkeypatch.setenv("SCHEDULER_SKIP_DOTENV", "1")
+    monkeypatch.setattr(core_config, "_DOTENV_LOADED", False)
+    core_config._ensure_dotenv()
+    assert len(calls) == 1
+    assert core_config._DOTENV_LOADED is True
+
+
 def test_flash_and_pop_round_trip():
     request = _build_request()
 
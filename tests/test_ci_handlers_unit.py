@@ -76,6 +76,104 @@ def test_api_calendar_rollover_and_payload_shape():
     }.issubset(first_day.keys())
 
 
+def test_api_calendar_counts_completed_step_logs_for_whole_grid_once():
+    db = _FakeDb(queued_results=[[(datetime.date(2026, 2, 10), 2)]])
+
+    payload = web_handlers.api_calendar(
+        _FakeRequest(query_params={"year": "2026", "month": "2"}),
+        db,
+        get_weekday_routines_fn=lambda _db, _weekday: [],
+    )
+
+    days = {day["date"]: day for week in payload["calendar_data"] for day in week}
+    assert days["2026-02-10"]["completed_steps"] == 2
+    assert days["2026-02-11"]["completed_steps"] == 0
+    daily_log_queries = [str(stmt) for stmt in db.exec_calls if "daily_log" in str(stmt)]
+    assert len(daily_log_queries) == 1
+    assert "count(*)" in daily_log_queries[0] and "GROUP BY daily_log.date" in daily_log_queries[0]
+
+
+def test_api_calendar_loads_custom_tasks_for_whole_grid_once():
+    tasks = [
+        SimpleNamespace(date=datetime.date(2026, 2, 10), done=True),
+        SimpleNamespace(date=datetime.date(2026, 2, 10), done=False),
+        SimpleNamespace(date=datetime.date(2026, 3, 1), done=True),
+    ]
+    db = _FakeDb(queued_results=[[], tasks])
+
+    payload = web_handlers.api_calendar(
+        _FakeRequest(query_params={"year": "2026", "month": "2"}),
+        db,
+        get_weekday_routines_fn=lambda _db, _weekday: [],
+    )
+
+    days = {day["date"]: day for week in payload["calendar_data"] for day in week}
+    assert (days["2026-02-10"]["custom_task_count"], days["2026-02-10"]["completed_steps"]) == (2, 1)
+    assert (days["2026-03-01"]["custom_task_count"], days["2026-03-01"]["completed_steps"]) == (1, 1)
+    assert days["2026-02-11"]["custom_task_count"] == 0
+    custom_task_queries = [stmt for stmt in db.exec_calls if "custom_task" in str(stmt)]
+    assert len(custom_task_queries) == 1
+
+
+def test_api_calendar_loads_day_logs_for_whole_grid_once():
+    day_logs = [
+        SimpleNamespace(date=datetime.date(2026, 2, 10), content="散歩"),
+        SimpleNamespace(date=datetime.date(2026, 2, 11), content="  "),
+        SimpleNamespace(date=datetime.date(2026, 2, 12), content=None),
+    ]
+    db = _FakeDb(queued_results=[[], [], day_logs])
+
+    payload = web_handlers.api_calendar(
+        _FakeRequest(query_params={"year": "2026", "month": "2"}),
+        db,
+        get_weekday_routines_fn=lambda _db, _weekday: [],
+    )
+
+    days = {day["date"]: day for week in payload["calendar_data"] for day in week}
+    assert [date for date, day in days.items() if day["has_day_log"]] == ["2026-02-10"]
+    assert len(db.exec_calls) == 3
+
+
+def test_api_calendar_fetches_routines_once_per_weekday():
+    calls = []
+
+    def _get_weekday_routines(_db, weekday):
+        calls.append(weekday)
+        return [SimpleNamespace(steps=[object(), object()])] if weekday == 0 else []
+
+    payload = web_handlers.api_calendar(
+        _FakeRequest(query_params={"year": "2026", "month": "3"}),
+        _FakeDb(),
+        get_weekday_routines_fn=_get_weekday_routines,
+    )
+
+    assert sorted(calls) == list(range(7))
+    mondays = [week[0] for week in payload["calendar_data"]]
+    assert all(day["total_steps"] == 2 and day["routine_count"] == 1 for day in mondays)
+
+
+def test_save_step_logs_from_form_reuses_existing_logs_in_one_query():
+    existing = SimpleNamespace(step_id=1, done=False, memo="")
+    db = _FakeDb(queued_results=[[existing]])
+    added = []
+    db.add = added.append
+    routines = [SimpleNamespace(steps=[SimpleNamespace(id=1), SimpleNamespace(id=2)])]
+
+    web_handlers._save_step_logs_from_form(
+        db,
+        {"done_1": "on", "memo_1": "ok", "memo_2": "later"},
+        datetime.date(2026, 2, 10),
+        routines,
+        "test-guest-id",
+    )
+
+    assert len(db.exec_calls) == 1
+    assert (existing.done, existing.memo) == (True, "ok")
+    assert [(log.step_id, log.done, log.memo, log.guest_id) for log in added] == [
+        (2, False, "later", "test-guest-id")
+    ]
+
+
 def test_api_day_view_serializes_timeline_items():
     timeline_items = [
         {
@@ -136,6 +234,24 @@ def test_api_routines_by_day_sorts_steps():
     assert [step["time"] for step in payload["routines"][0]["steps"]] == ["08:00", "11:00"]
 
 
+def test_api_routines_preloads_steps_in_the_routine_query():
+    routine = SimpleNamespace(
+        id=1,
+        name="Morning Routine",
+        days="0,1",
+        description="desc",
+        steps=[SimpleNamespace(id=11, name="Coffee", time="08:00", category="Lifestyle")],
+    )
+    db = _FakeDb([[routine]])
+
+    payload = web_handlers.api_routines(db, _FakeRequest())
+
+    assert payload["routines"][0]["steps"][0]["name"] == "Coffee"
+    assert len(db.exec_calls) == 1
+    (loader,) = db.exec_calls[0]._with_options
+    assert "steps" in str(loader.path)
+
+
 def test_chat_rejects_non_list_messages():
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(
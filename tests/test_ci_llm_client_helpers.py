@@ -183,3 +183,46 @@ def test_sanitize_text_blocks_multiple_function_marker_variants():
 
 def test_sanitize_text_preserves_non_string_input_by_stringifying():
     assert llm_client._sanitize_text(123) == "123"
+
+
+def test_safe_json_loads_matches_with_and_without_orjson(monkeypatch):
+    samples = ['{"a": 1, "b": [true, null]}', '{"x": NaN}', "[1, 2]", "not json", '{"日本": "語"}']
+    fast = [llm_client._safe_json_loads(sample) for sample in samples]
+
+    monkeypatch.setattr(llm_client, "orjson", None)
+    slow = [llm_client._safe_json_loads(sample) for sample in samples]
+
+    assert repr(fast) == repr(slow)
+    assert slow[0] == {"a": 1, "b": [True, None]}
+    assert slow[2:4] == [{}, {}]
+
+
+def test_call_scheduler_llm_puts_static_instructions_first_for_claude(monkeypatch):
+    monkeypatch.setattr(llm_client, "run_prompt_guard", lambda _user_input: {"blocked": False})
+    monkeypatch.setattr(llm_client, "reserve_monthly_llm_request_or_raise", lambda: None)
+    monkeypatch.setattr(llm_client, "SCHEDULER_TOOLS", [])
+
+    captured: dict = {}
+
+    class _DummyMessages:
+        def create(self, **kwargs):
+            captured.update(kwargs)
+            return SimpleNamespace(content=[SimpleNamespace(type="text", text="ok")])
+
+    class _DummyUnifiedClient:
+        def __init__(self):
+            self.provider = "claude"
+            self.model_name = "dummy-model"
+            self.client = SimpleNamespace(messages=_DummyMessages())
+
+    monkeypatch.setattr(llm_client, "UnifiedClient", _DummyUnifiedClient)
+
+    reply, _ = llm_client.call_scheduler_llm([{"role": "user", "content": "テスト"}], "context")
+
+    static_block, dynamic_block = captured["system"]
+    assert reply == "ok"
+    assert static_block["text"] == llm_client._SCHEDULER_SYSTEM_PROMPT
+    assert static_block["cache_control"] == {"type": "ephemeral"}
+    assert "現在日時" not in static_block["text"]
+    assert dynamic_block["text"].startswith("現在日時: ")
+    assert dynamic_block["text"].endswith("context")
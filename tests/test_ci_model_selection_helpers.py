@@ -28,9 +28,9 @@ def test_apply_model_selection_uses_override_and_env_api_key(monkeypatch):
 
 
 def test_normalise_base_url_sanitizes_cross_provider_values():
-    gemini_meta = model_selection.PROVIDER_DEFAULTS["gemini"]
-    groq_meta = model_selection.PROVIDER_DEFAULTS["groq"]
-    openai_meta = model_selection.PROVIDER_DEFAULTS["openai"]
+    gemini_meta = model_selection._PROVIDER_META["gemini"]
+    groq_meta = model_selection._PROVIDER_META["groq"]
+    openai_meta = model_selection._PROVIDER_META["openai"]
 
     assert (
         model_selection._normalise_base_url(
@@ -59,8 +59,8 @@ def test_normalise_base_url_sanitizes_cross_provider_values():
 
 
 def test_normalise_base_url_rejects_unsafe_schemes_and_private_hosts():
-    groq_meta = model_selection.PROVIDER_DEFAULTS["groq"]
-    openai_meta = model_selection.PROVIDER_DEFAULTS["openai"]
+    groq_meta = model_selection._PROVIDER_META["groq"]
+    openai_meta = model_selection._PROVIDER_META["openai"]
 
     assert (
         model_selection._normalise_base_url(
@@ -119,3 +119,35 @@ def test_provider_supports_vision():
     assert model_selection.provider_supports_vision("claude") is True
     assert model_selection.provider_supports_vision("gemini") is True
     assert model_selection.provider_supports_vision("groq") is False
+
+
+def test_normalise_base_url_empty_input_uses_provider_default():
+    for base_url in (None, "", "   "):
+        assert (
+            model_selection._normalise_base_url(
+                "gemini",
+                base_url,
+                model_selection._PROVIDER_META["gemini"],
+            )
+            == "https://generativelanguage.googleapis.com/v1beta/openai"
+        )
+        assert (
+            model_selection._normalise_base_url(
+                "openai",
+                base_url,
+                model_selection._PROVIDER_META["openai"],
+            )
+            is None
+        )
+
+
+def test_provider_meta_resolves_alias_env_names(monkeypatch):
+    monkeypatch.delenv("CLAUDE_API_KEY", raising=False)
+    monkeypatch.delenv("claude_api_key", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "anthropic-test-key")
+
+    meta = model_selection._PROVIDER_META["claude"]
+
+    assert meta.api_env_names == ("CLAUDE_API_KEY", "claude_api_key", "ANTHROPIC_API_KEY", "anthropic_api_key")
+    assert model_selection._resolve_api_key(meta) == "anthropic-test-key"
+    assert model_selection._PROVIDER_META["groq"].default_base_url == "https://api.groq.com/openai/v1"
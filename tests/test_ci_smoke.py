@@ -1,11 +1,18 @@
 import datetime
 
+from scheduler_agent.services.chat_orchestration_service import _extract_resolved_memory_from_actions
 from scheduler_agent.services.reply_service import (
     _attach_execution_trace_to_stored_content,
     _extract_execution_trace_from_stored_content,
     _remove_no_schedule_lines,
 )
-from scheduler_agent.services.schedule_parser_service import _resolve_schedule_expression
+from scheduler_agent.services.schedule_parser_service import (
+    _is_relative_datetime_text,
+    _parse_date,
+    _requires_date_resolution,
+    _resolve_schedule_expression,
+    _try_parse_iso_date,
+)
 
 
 def test_execution_trace_round_trip():
@@ -40,3 +47,85 @@ def test_resolve_schedule_expression_handles_relative_day_with_time():
     assert resolved["ok"] is True
     assert resolved["date"] == "2026-02-15"
     assert resolved["time"] == "14:30"
+
+
+def test_relative_datetime_detection_uses_tokens_and_patterns():
+    assert _is_relative_datetime_text("明日の朝")
+    assert _is_relative_datetime_text("3日後")
+    assert _is_relative_datetime_text("金曜日")
+    assert _is_relative_datetime_text("next Friday")
+    assert not _is_relative_datetime_text("2026-03-25")
+    assert not _is_relative_datetime_text(None)
+    assert _is_relative_datetime_text(" 明日の朝 ") and _is_relative_datetime_text("明日の朝")
+
+    assert _requires_date_resolution("来週")
+    assert not _requires_date_resolution(" 2026-03-25 ")
+    assert not _requires_date_resolution("")
+
+
+def test_resolve_schedule_expression_returns_independent_copies():
+    base_date = datetime.date(2026, 2, 12)
+    first = _resolve_schedule_expression("来週の月曜 10時", base_date, "09:00", "00:00")
+    first["date"] = "mutated"
+    second = _resolve_schedule_expression("来週の月曜 10時", base_date, "09:00", "00:00")
+
+    assert second["ok"] is True
+    assert second["date"] == "2026-02-16"
+    assert second["time"] == "10:00"
+
+
+def test_resolve_schedule_expression_collapses_whitespace_variants():
+    base_date = datetime.date(2026, 2, 12)
+    spaced = _resolve_schedule_expression("3 日後　　14:30", base_date, "09:00", "00:00")
+    compact = _resolve_schedule_expression("3 日後 14:30", base_date, "09:00", "00:00")
+
+    assert spaced == compact
+    assert spaced["date"] == "2026-02-15"
+
+
+def test_resolve_schedule_expression_folds_width_and_japanese_spacing():
+    base_date = datetime.date(2026, 2, 12)
+
+    for expression in ("3日後 14:30", "3日後14:30", "3 日後 14:30", "３ 日 後　１４：３０"):
+        resolved = _resolve_schedule_expression(expression, base_date, "09:00", "00:00")
+        assert (resolved["date"], resolved["time"]) == ("2026-02-15", "14:30"), expression
+    assert _resolve_schedule_expression("来 週 mon", base_date)["source"] == "relative_week"
+    assert "period_start" not in _resolve_schedule_expression("来週 mon", base_date)
+
+
+def test_resolve_schedule_expression_error_echoes_original_text():
+    resolved = _resolve_schedule_expression(" 来月 1日 ", datetime.date(2026, 2, 12))
+
+    assert resolved == {"ok": False, "error": "日付表現を解釈できませんでした: 来月 1日"}
+
+
+def test_extract_resolved_memory_dispatches_calc_actions():
+    memories = _extract_resolved_memory_from_actions(
+        [
+            {"type": "calc_date_offset", "base_date": "2026-03-25", "offset_days": 2},
+            {"type": "calc_week_range", "base_date": "bad"},
+            {"type": "create_custom_task", "name": "x"},
+            {"type": ["calc_date_offset"]},
+            {"type": "get_date_info", "date": "2026-03-28"},
+        ],
+        datetime.date(2026, 3, 25),
+    )
+
+    assert [memory["expression"] for memory in memories] == [
+        "calc_date_offset(2026-03-25, 2)",
+        "get_date_info(2026-03-28)",
+    ]
+    assert memories[0]["date"] == "2026-03-27"
+
+
+def test_iso_date_fast_path_keeps_fallback_behaviour():
+    default = datetime.date(2026, 1, 1)
+
+    assert _parse_date(" 2026-03-25 ", default) == datetime.date(2026, 3, 25)
+    assert _parse_date("2026-3-5", default) == datetime.date(2026, 3, 5)
+    assert _parse_date("2026-02-30", default) == default
+    assert _parse_date("2026/03/25", default) == _parse_date(" 2026/03/25 ", default) == datetime.date(2026, 3, 25)
+    assert _try_parse_iso_date("2026-03-25") == datetime.date(2026, 3, 25)
+    assert _try_parse_iso_date("2026-02-30") is None
+    assert _try_parse_iso_date(" 2026-3-5 ") == _try_parse_iso_date("2026-3-5") == datetime.date(2026, 3, 5)
+    assert _try_parse_iso_date("  ") is None and _try_parse_iso_date(20260325) is None